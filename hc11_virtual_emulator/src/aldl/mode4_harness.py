@@ -32,7 +32,7 @@ VX/VY V6 Mode 4 Frame (request from scan tool → PCM):
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 
 # ══════════════════════════════════════════════
@@ -150,8 +150,7 @@ def aldl_checksum(data: bytes) -> int:
       - vy_instrument_diagnostics.py
       - aldlparser_FULL_DECOMPILED.py
     """
-    total = sum(data) & 0xFF
-    return (0x100 - total) & 0xFF if total else 0
+    return -sum(data) & 0xFF
 
 
 def validate_checksum(frame: bytes) -> bool:
@@ -159,6 +158,18 @@ def validate_checksum(frame: bytes) -> bool:
     return (sum(frame) & 0xFF) == 0
 
 
+def verify_and_extract(frame: bytes) -> Tuple[bool, bytes]:
+    """Validate a frame and return its payload in one pass over the bytes.
+    
+    Returns (checksum_valid, payload) where payload is everything between
+    the length byte and the checksum — for Mode 4 that is the 23 control
+    bytes, starting with the mode byte.
+    """
+    body = memoryview(frame)[:-1]
+    valid = (-sum(body) & 0xFF) == frame[-1]
+    return valid, bytes(body[2:])
+
+
 # ══════════════════════════════════════════════
 # Mode 4 Frame Builder
 # ══════════════════════════════════════════════
@@ -282,9 +293,7 @@ class Mode4Frame:
     
     def hexdump(self) -> str:
         """Display frame as hex string for debugging."""
-        frame = self.build_frame()
-        hex_str = ' '.join(f'{b:02X}' for b in frame)
-        return hex_str
+        return self.build_frame().hex(' ').upper()
 
 
 # ══════════════════════════════════════════════
@@ -487,7 +496,7 @@ class Mode4TestHarness:
         reason = self.emulator.run(max_cycles=run_cycles)
         
         result = {
-            'frame_hex': ' '.join(f'{b:02X}' for b in aldl_frame),
+            'frame_hex': aldl_frame.hex(' ').upper(),
             'tx_output': self.emulator.sci.sci_output,
             'portb_state': self.emulator.ports.get_port(0x1004),
             'portb_bits': self.emulator.ports.get_portb_bits(),
@@ -447,6 +447,16 @@ OPCODES_PAGE4 = {
 # Combine all multi-byte opcode tables
 ALL_OPCODES_PAGED = {**OPCODES_PAGE2, **OPCODES_PAGE3, **OPCODES_PAGE4}
 
+# Flat 256-entry decode tables, indexed by opcode byte. None = undefined.
+# decode_opcode() runs once per emulated instruction, so it indexes these
+# tuples instead of doing membership tests + dict lookups on the tables above.
+_DECODE_PAGE1 = tuple(OPCODES.get(op) for op in range(256))
+_DECODE_PAGES = tuple(
+    tuple(ALL_OPCODES_PAGED.get((op, op2)) for op2 in range(256))
+    if op in PREBYTE_LIST else None
+    for op in range(256)
+)
+
 
 class IllegalOpcode(Exception):
     """Raised when an undefined opcode is encountered."""
@@ -466,20 +476,19 @@ def decode_opcode(memory, pc: int):
     opcode = memory.read8(pc)
     pc_next = (pc + 1) & 0xFFFF
     
-    if opcode in PREBYTE_LIST:
+    page = _DECODE_PAGES[opcode]
+    if page is not None:
         opcode2 = memory.read8(pc_next)
         pc_next = (pc_next + 1) & 0xFFFF
-        key = (opcode, opcode2)
-        
-        if key in ALL_OPCODES_PAGED:
-            mnem, mode, cycles = ALL_OPCODES_PAGED[key]
-            return mnem, mode, cycles, pc_next
-        else:
+        entry = page[opcode2]
+        if entry is None:
             raise IllegalOpcode(
                 f"Unknown paged opcode ${opcode:02X} ${opcode2:02X} at ${pc:04X}")
-    
-    if opcode in OPCODES:
-        mnem, mode, cycles = OPCODES[opcode]
+        mnem, mode, cycles = entry
         return mnem, mode, cycles, pc_next
     
-    raise IllegalOpcode(f"Unknown opcode ${opcode:02X} at ${pc:04X}")
+    entry = _DECODE_PAGE1[opcode]
+    if entry is None:
+        raise IllegalOpcode(f"Unknown opcode ${opcode:02X} at ${pc:04X}")
+    mnem, mode, cycles = entry
+    return mnem, mode, cycles, pc_next
@@ -48,6 +48,16 @@ from .periph.ports import PortsPeripheral
 from .periph.timer import TimerPeripheral
 
 
+# Default SWI vector ($FFF6-$FFF7), installed once at power-on. It points
+# at a TEST ($00) trampoline in the reserved $FFC0 vector slot — ROM space,
+# so program stores can't clobber it — and an SWI with no handler loaded
+# halts the run loop cleanly. A ROM image that supplies its own vectors
+# overwrites both; reset() leaves them alone.
+SWI_VECTOR = 0xFFF6
+_SWI_HALT_TRAMPOLINE = 0xFFC0
+_DEFAULT_SWI_VECTOR = _SWI_HALT_TRAMPOLINE.to_bytes(2, 'big')
+
+
 class StopReason(Enum):
     TIMEOUT = 'TIMEOUT'
     BREAK = 'BREAK'
@@ -101,6 +111,10 @@ class HC11Emulator:
         
         # Instruction dispatch table (built in _build_dispatch)
         self._dispatch = self._build_dispatch()
+        
+        # Point SWI at a halt so test programs can end with a bare SWI
+        self.mem.load_binary(b'\x00', _SWI_HALT_TRAMPOLINE)  # TEST
+        self.mem.load_binary(_DEFAULT_SWI_VECTOR, SWI_VECTOR)
     
     # ══════════════════════════════════════════════
     # Loading
@@ -207,14 +221,21 @@ class HC11Emulator:
         if max_cycles is None:
             max_cycles = self.DEFAULT_MAX_CYCLES
         
+        # Search the live TX bytearray (sci_output copies to bytes), and
+        # only when it has grown since the last check
+        tx = self.sci.tx_buffer
+        tx_seen = -1
+        
         while self.regs.cycles < max_cycles:
             reason = self.step()
             if reason is not None:
                 return reason
             
             # Check for expected SCI output
-            if expected_output and expected_output in self.sci.sci_output:
-                return StopReason.DONE
+            if expected_output and len(tx) != tx_seen:
+                tx_seen = len(tx)
+                if expected_output in tx:
+                    return StopReason.DONE
         
         return StopReason.TIMEOUT
     
@@ -1236,7 +1257,7 @@ class HC11Emulator:
         self.regs.push8(self.mem, self.regs.B)
         self.regs.push8(self.mem, self.regs.CC)
         self.regs.set_I(CC_I)
-        self.regs.PC = self.mem.read16(0xFFF6)  # SWI vector at $FFF6-$FFF7
+        self.regs.PC = self.mem.read16(SWI_VECTOR)  # SWI vector at $FFF6-$FFF7
     
     def _op_stop(self, mode, ops):
         raise _StopException("STOP")
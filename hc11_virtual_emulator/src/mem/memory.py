@@ -24,6 +24,10 @@ from typing import Optional, Callable, Dict, List
 from pathlib import Path
 
 
+# Byte → printable ASCII for hexdump (non-printables become '.')
+_ASCII_TBL = bytes(c if 0x20 <= c < 0x7F else 0x2E for c in range(256))
+
+
 class MemoryRegion:
     """A named region in the 64K address space."""
     def __init__(self, name: str, start: int, end: int, 
@@ -136,7 +140,20 @@ class Memory:
         """Write 16-bit value (big-endian)."""
         self.write8(addr, (value >> 8) & 0xFF)
         self.write8(addr + 1, value & 0xFF)
-    
+
+    def read_block(self, addr: int, length: int) -> bytes:
+        """Read `length` raw bytes starting at addr as one slice.
+
+        Bypasses I/O handlers (like snapshot_ram) — meant for bulk
+        inspection of RAM/ROM, not for peripheral register reads.
+        Wraps at $FFFF the same way read8 does.
+        """
+        addr &= 0xFFFF
+        end = addr + length
+        if end <= 0x10000:
+            return bytes(self._mem[addr:end])
+        return bytes(self._mem[addr:]) + bytes(self._mem[:end - 0x10000])
+
     # --- Bulk load ---
     
     def load_binary(self, data: bytes, base_addr: int):
@@ -263,12 +280,8 @@ class Memory:
         lines = []
         for offset in range(0, length, 16):
             addr = (start + offset) & 0xFFFF
-            hex_bytes = ' '.join(f'{self._mem[(addr + i) & 0xFFFF]:02X}' 
-                                for i in range(16))
-            ascii_bytes = ''.join(
-                chr(self._mem[(addr + i) & 0xFFFF]) 
-                if 0x20 <= self._mem[(addr + i) & 0xFFFF] < 0x7F else '.'
-                for i in range(16)
-            )
+            row = self.read_block(addr, 16)
+            hex_bytes = row.hex(' ').upper()
+            ascii_bytes = row.translate(_ASCII_TBL).decode('ascii')
             lines.append(f'{addr:04X}  {hex_bytes}  {ascii_bytes}')
         return '\n'.join(lines)
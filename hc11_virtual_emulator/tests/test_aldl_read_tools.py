@@ -0,0 +1,228 @@
+"""
+HC11 Virtual Emulator — ALDL RAM Reader Tool Tests
+
+Frame building and loopback reads for tools/ALDL_read_RAM_commands.py.
+Uses the LoopbackALDL transport — no serial hardware required.
+
+Cross-references:
+  - tools/virtual_aldl_frame_sender_and_vecu.py (VECU checksum oracle)
+  - src/aldl/mode4_harness.py validate_checksum (sum of frame mod 256 = 0)
+"""
+
+import sys
+import os
+
+# tools/ is a script directory, not a package
+_TOOLS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools')
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+from ALDL_read_RAM_commands import (
+    build_mode2_read, build_silence_frame, update_mode2_address, verify_checksum,
+    IncrementalChecksum, known_addresses_in, hex_dump, verify_capture,
+    verify_checksums_batch,
+    ALDLSerial, LoopbackALDL, read_ram, read_range, print_progress,
+)
+
+
+def _wire(frame) -> bytes:
+    """Bytes actually sent on the ALDL wire (up to and incl. checksum)."""
+    return bytes(frame[:frame[1] - 82])
+
+
+class TestFrameChecksum:
+    """Every byte on the wire, checksum included, must sum to 0 mod 256."""
+
+    def test_mode2_standard(self):
+        """Mode 2 read $77C0 → F7 58 02 77 C0 + checksum"""
+        frame = build_mode2_read(0xF7, 0x77C0)
+        wire = _wire(frame)
+        assert len(frame) == len(wire) == 6
+        assert wire[:5] == bytes([0xF7, 0x58, 0x02, 0x77, 0xC0])
+        assert sum(wire) & 0xFF == 0
+        assert verify_checksum(wire)
+
+    def test_mode2_extended(self):
+        """Extended read $1FFE0 → bank byte $01 included in checksum"""
+        wire = _wire(build_mode2_read(0xF7, 0x1FFE0, extended=True))
+        assert wire[:6] == bytes([0xF7, 0x59, 0x02, 0x01, 0xFF, 0xE0])
+        assert sum(wire) & 0xFF == 0
+
+    def test_silence(self):
+        wire = _wire(build_silence_frame(0xF1))
+        assert wire[:3] == bytes([0xF1, 0x56, 0x08])
+        assert sum(wire) & 0xFF == 0
+
+    def test_update_address_matches_fresh_build(self):
+        """Patching the address in place == building a new frame"""
+        for extended, addrs in ((False, (0x0000, 0x77DE, 0xFFC0)),
+                                (True, (0x18000, 0x1FFE0, 0x00040))):
+            frame = build_mode2_read(0xF7, 0x4000, extended)
+            for addr in addrs:
+                update_mode2_address(frame, addr)
+                assert frame == build_mode2_read(0xF7, addr, extended)
+
+    def test_incremental_checksum_resume(self):
+        """Editing a byte via IncrementalChecksum keeps the frame valid"""
+        frame = build_mode2_read(0xF7, 0x4000)
+        ck = IncrementalChecksum.resume(frame)
+        ck.set_byte(frame, 0, 0xF4)
+        ck.finalize(frame)
+        assert frame == build_mode2_read(0xF4, 0x4000)
+
+    def test_corrupt_frame_rejected(self):
+        wire = bytearray(_wire(build_mode2_read(0xF7, 0x4000)))
+        wire[4] ^= 0x01
+        assert not verify_checksum(bytes(wire))
+
+    def test_known_addresses_in_window(self):
+        """Half-open window: [start, start + length)"""
+        assert known_addresses_in(0x77C0, 0x20) == (0x77C0, 0x77DE, 0x77DF)
+        assert known_addresses_in(0x77C1, 0x1D) == ()
+        assert known_addresses_in(0x4000, 8) == (0x4000, 0x4006, 0x4007)
+
+    def test_verify_capture(self):
+        """Back-to-back request/response capture; one corrupted frame"""
+        ecu = LoopbackALDL()
+        capture = bytearray()
+        for addr in (0x0000, 0x0040, 0x0080):
+            req = build_mode2_read(0xF7, addr)
+            capture += req + ecu.transact(req)
+        capture[6 + 10] ^= 0xFF  # first response, data byte
+        good, bad = verify_capture(capture)
+        assert good == 5 and bad == [6]
+
+    def test_verify_checksums_batch(self):
+        """Batch result matches verify_checksum frame by frame"""
+        good = _wire(build_mode2_read(0xF7, 0x4000))
+        bad = bytes([good[0] ^ 1]) + good[1:]
+        frames = [good, bad, _wire(build_silence_frame(0xF1)), b'\xF7', good[:4]]
+        assert verify_checksums_batch(frames) == [verify_checksum(f) for f in frames]
+        assert verify_checksums_batch(frames) == [True, False, True, False, False]
+
+
+class TestLoopbackRead:
+    """Mode 2 reads served from the loopback virtual ECU."""
+
+    def _transport(self) -> LoopbackALDL:
+        t = LoopbackALDL()
+        for i in range(0x200):
+            t.flash[i] = i & 0xFF
+        return t
+
+    def test_bin_file_mapped_copy_on_write(self, tmp_path):
+        """Reads come from the bin; writes to flash don't touch the file"""
+        bin_path = tmp_path / 'cal.bin'
+        bin_path.write_bytes(bytes(range(0x50)) + bytes(0x20000 - 0x50))
+        t = LoopbackALDL(str(bin_path))
+        assert read_ram(t, 0x0040) == bytes(range(0x40, 0x50)) + bytes(48)
+        t.flash[0] = 0xAA
+        t.close()
+        assert bin_path.read_bytes()[0] == 0x00
+
+    def test_short_bin_padded_to_128kb(self, tmp_path):
+        """A bin shorter than 128KB is zero-padded out to full size"""
+        bin_path = tmp_path / 'short.bin'
+        bin_path.write_bytes(bytes(range(0x50)))
+        t = LoopbackALDL(str(bin_path))
+        assert len(t.flash) == 0x20000
+        assert read_ram(t, 0x0040) == bytes(range(0x40, 0x50)) + bytes(48)
+
+    def test_read_after_close_returns_zeros(self, tmp_path):
+        """close() leaves zeroed flash behind instead of a closed mapping"""
+        bin_path = tmp_path / 'cal.bin'
+        bin_path.write_bytes(b'\xFF' * 0x20000)
+        t = LoopbackALDL(str(bin_path))
+        assert read_ram(t, 0x0000) == b'\xFF' * 64
+        t.close()
+        assert len(t.flash) == 0x20000
+        assert read_ram(t, 0x0000) == bytes(64)
+
+    def test_silence_ack(self):
+        """Mode 8 ack is a valid 4-byte frame"""
+        resp = LoopbackALDL().transact(build_silence_frame(0xF7))
+        assert len(resp) == 4 and resp[2] == 0x08
+        assert verify_checksum(resp)
+
+    def test_mode2_response_checksum(self):
+        """Full and zero-padded (past end of flash) responses both verify"""
+        t = self._transport()
+        for addr in (0x0040, len(t.flash) - 8):
+            resp = t.transact(build_mode2_read(0xF7, addr, extended=True))
+            assert len(resp) == 68 and verify_checksum(resp)
+
+    def test_read_ram_block(self):
+        data = read_ram(self._transport(), 0x0040)
+        assert data == bytes(range(0x40, 0x80))
+
+    def test_read_range_unaligned(self):
+        """200 bytes = 3 full blocks + an 8-byte tail"""
+        data = read_range(self._transport(), 0x0000, 200, progress=None)
+        assert bytes(data) == bytes(i & 0xFF for i in range(200))
+
+    def test_read_range_progress_callback(self):
+        """progress() fires once per completed block"""
+        calls = []
+        read_range(self._transport(), 0x0100, 128,
+                   progress=lambda *args: calls.append(args))
+        assert calls == [(0x0100, 128, 64, 1, 2), (0x0100, 128, 128, 2, 2)]
+
+    def test_print_progress_throttled(self, capsys):
+        """A fast 64 KB read redraws far fewer times than it has blocks"""
+        for block in range(1, 1025):
+            print_progress(0x0000, 0x10000, block * 64, block, 1024)
+        out = capsys.readouterr().out
+        assert out.count('\r') < 100
+        assert out.endswith('[100%]  65536/65536 bytes\n')
+
+
+class _EchoSerial:
+    """pyserial stand-in: echoes TX, then answers from the loopback ECU."""
+
+    def __init__(self, ecu: LoopbackALDL):
+        self.ecu = ecu
+        self.timeout = None
+        self._rx = bytearray()
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+    def write(self, data):
+        self._rx += data
+        self._rx += self.ecu.transact(bytearray(data))
+
+    def flush(self):
+        pass
+
+    def read(self, n):
+        out = bytes(self._rx[:n])
+        del self._rx[:n]
+        return out
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self._rx))
+        buf[:n] = self._rx[:n]
+        del self._rx[:n]
+        return n
+
+
+class TestSerialTransport:
+    """ALDLSerial framing over a fake half-duplex port."""
+
+    def test_transact_skips_echo(self):
+        ecu = LoopbackALDL()
+        ecu.flash[0x77C0:0x7800] = bytes(range(64))
+        port = ALDLSerial('loop')
+        port._serial = _EchoSerial(ecu)
+        assert read_ram(port, 0x77C0) == bytes(range(64))
+        assert read_ram(port, 0x77C0) == bytes(range(64))
+
+
+class TestDisplay:
+    """Console formatting helpers."""
+
+    def test_hex_dump_row(self):
+        """Upper-case hex, non-printables shown as '.', short row padded"""
+        dump = hex_dump(bytearray(b'\x00AZ\x7f'), 0x77C0)
+        assert dump == "  $077C0: 00 41 5A 7F" + " " * 39 + ".AZ."
@@ -0,0 +1,101 @@
+"""
+HC11 Virtual Emulator — Standalone Disassembler Tool Tests
+
+Decode and formatting checks for tools/hc11_disassembler.py.
+
+Cross-references:
+  - src/cpu/decoder.py (emulator opcode table — same prebyte pages)
+  - Motorola MC68HC11 Reference Manual Rev3 Appendix A
+"""
+
+import sys
+import os
+
+# tools/ is a script directory, not a package
+_TOOLS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools')
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+from hc11_disassembler import (
+    HC11Disassembler, MODE_EXTENDED, MODE_NAMES, disassemble_hex,
+)
+
+
+class TestDecode:
+    """Single-instruction decode across the prebyte pages."""
+
+    def test_extended_with_annotation(self):
+        inst = HC11Disassembler().decode_one(b'\xB6\x77\xDE', 0, 0x8000)
+        assert inst.format() == "$8000: B6 77 DE       LDAA $77DE  ; Rev Limit High"
+        assert inst.mode == MODE_EXTENDED and inst.mode_name == MODE_NAMES[inst.mode] == "ext"
+
+    def test_prebyte_pages(self):
+        lines = [r.format() for r in disassemble_hex("18 08 1A 83 00 A4 CD A3 10 39", 0xC000)]
+        assert lines == [
+            "$C000: 18 08          INY",
+            "$C002: 1A 83 00 A4    CPD #$00A4",
+            "$C006: CD A3 10       CPD $10,Y",
+            "$C009: 39             RTS",
+        ]
+
+    def test_unknown_and_truncated_as_db(self):
+        results = HC11Disassembler().disassemble(b'\x41\xB6\x77')
+        assert [(r.mnemonic, r.operand_str) for r in results] == [
+            ("DB", "$41"), ("DB", "$B6 $77")]
+
+    def test_tables_shared_between_instances(self):
+        a, b = HC11Disassembler(), HC11Disassembler()
+        assert a._base is b._base and a._page2 is b._page2
+        assert a.get_stats() == b.get_stats()
+
+    def test_instruction_offsets_match_disassemble(self):
+        """Length-table walk agrees with full decode, incl. DB and truncation"""
+        dis = HC11Disassembler()
+        for hex_str in ("B677DE 18CE1234 41 1A83 CD00 39 18", "18 18 1A CD 18 1A 83"):
+            data = bytes.fromhex(hex_str)
+            assert dis.instruction_offsets(data) == [r.address for r in dis.disassemble(data)]
+
+    def test_operand_and_comment_rendered_lazily(self):
+        inst = HC11Disassembler().decode_one(b'\xBD\x35\xFF', 0, 0x8000)
+        assert inst._operand_str is None and inst._comment is None
+        assert inst.operand_str == "$35FF"
+        comment = inst.comment
+        assert "TIC3_24X_ISR" in comment and inst.comment is comment
+        assert inst.length == 3
+
+    def test_fixed_rendering_shared_across_addresses(self):
+        """Same bytes at two addresses reuse one rendering; branches don't"""
+        results = disassemble_hex("B6 77 DE 26 05 B6 77 DE 26 05", 0x8000)
+        a, b = results[::2], results[1::2]
+        assert a[0].operand_str is a[1].operand_str and a[0].comment is a[1].comment
+        assert [r.operand_str for r in b] == ["$800A", "$800F"]
+
+    def test_disassemble_raw_materializes_on_demand(self):
+        data = bytes.fromhex("B677DE 18CE1234 41 39 B6")
+        dis = HC11Disassembler()
+        block = dis.disassemble_raw(data, 0x8000)
+        assert len(block) == 5
+        assert block.lengths().tolist() == [3, 4, 1, 1, 1]
+        assert block[1] == dis.decode_one(data, 3, 0x8003)
+        assert list(block) == block[:] == dis.disassemble(data, 0x8000)
+
+    def test_parse_hex_formats(self):
+        parse = HC11Disassembler._parse_hex
+        for text in ("B6 77DE", "B6,77,DE", "0xB6 0x77 0XDE", "b6;77\r\n\tde", "B677DE"):
+            assert parse(text) == b'\xB6\x77\xDE'
+        assert parse("  \n") == b""
+
+    def test_raw_bytes_sliced_lazily(self):
+        """Lazy raw_bytes is plain bytes, and unaffected by later buffer edits"""
+        buf = bytearray(b'\x00\xB6\x77\xDE')
+        inst = HC11Disassembler().decode_one(buf, 1, 0x8001)
+        buf[2] = 0x00
+        assert inst.length == 3 and inst.raw_bytes == b'\xB6\x77\xDE'
+        assert type(inst.raw_bytes) is bytes and inst.operand_str == "$77DE"
+
+    def test_iter_disassemble_matches_list(self):
+        data = bytes.fromhex("B677DE 18CE1234 41 1A83 CD00 39 18")
+        dis = HC11Disassembler()
+        assert list(dis.iter_disassemble(data, 0x8000)) == dis.disassemble(data, 0x8000)
+        assert list(dis.iter_disassemble(data, 0x8000, 2)) == dis.disassemble(data, 0x8000, 2)
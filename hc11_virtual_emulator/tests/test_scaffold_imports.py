@@ -12,10 +12,36 @@ Usage:
 
 import sys
 import os
+import importlib
 
 # Add parent dir to path so src is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+# (display name, dotted module path) — built once at import time
+_MODULES = (
+    ("CPU Registers",   "src.cpu.regs"),
+    ("ALU Operations",  "src.cpu.alu"),
+    ("Opcode Decoder",  "src.cpu.decoder"),
+    ("Memory Map",      "src.mem.memory"),
+    ("SCI Peripheral",  "src.periph.sci"),
+    ("ADC Peripheral",  "src.periph.adc"),
+    ("I/O Ports",       "src.periph.ports"),
+    ("Timer",           "src.periph.timer"),
+    ("ALDL Mode 4",     "src.aldl.mode4_harness"),
+    ("Main Emulator",   "src.emu"),
+)
+
+
+def _check_import(name: str, module_path: str) -> tuple:
+    try:
+        importlib.import_module(module_path)
+        print(f"  ✓ {name:20s} → {module_path}")
+        return (name, "OK")
+    except Exception as e:
+        print(f"  ✗ {name:20s} → {module_path}")
+        print(f"    ERROR: {e}")
+        return (name, f"FAIL: {e}")
+
 
 def test_imports():
     """Verify all scaffold modules load without import errors."""
@@ -23,30 +49,7 @@ def test_imports():
     print("  HC11 Virtual Emulator — Scaffold Import Check")
     print("─" * 50)
     
-    results = []
-    
-    modules = [
-        ("CPU Registers",   "src.cpu.regs"),
-        ("ALU Operations",  "src.cpu.alu"),
-        ("Opcode Decoder",  "src.cpu.decoder"),
-        ("Memory Map",      "src.mem.memory"),
-        ("SCI Peripheral",  "src.periph.sci"),
-        ("ADC Peripheral",  "src.periph.adc"),
-        ("I/O Ports",       "src.periph.ports"),
-        ("Timer",           "src.periph.timer"),
-        ("ALDL Mode 4",     "src.aldl.mode4_harness"),
-        ("Main Emulator",   "src.emu"),
-    ]
-    
-    for name, module_path in modules:
-        try:
-            __import__(module_path)
-            results.append((name, "OK"))
-            print(f"  ✓ {name:20s} → {module_path}")
-        except Exception as e:
-            results.append((name, f"FAIL: {e}"))
-            print(f"  ✗ {name:20s} → {module_path}")
-            print(f"    ERROR: {e}")
+    results = [_check_import(name, path) for name, path in _MODULES]
     
     print("─" * 50)
     
@@ -113,13 +116,14 @@ def test_imports():
         print(f"    ✗ SCI: {e}")
     
     try:
-        from src.aldl.mode4_harness import Mode4Frame, aldl_checksum, validate_checksum
+        from src.aldl.mode4_harness import Mode4Frame, verify_and_extract
         frame = Mode4Frame()
         frame.set_fan(True)
         raw = frame.build_frame()
         assert raw[0] == 0xF7, f"Device addr: {raw[0]:02X}"
-        assert raw[2] == 0x04, f"Mode byte: {raw[2]:02X}"
-        assert validate_checksum(raw), f"Checksum invalid: {raw.hex()}"
+        valid, payload = verify_and_extract(raw)
+        assert payload[0] == 0x04, f"Mode byte: {payload[0]:02X}"
+        assert valid, f"Checksum invalid: {raw.hex()}"
         print(f"    ✓ Mode 4 frame build + checksum")
     except Exception as e:
         print(f"    ✗ Mode 4: {e}")
@@ -132,7 +136,10 @@ def test_imports():
         mem2.load_binary(bytes([0x86, 0x42]), 0x1000)  # LDAA #$42
         mnem, mode, cycles, next_pc = decode_opcode(mem2, 0x1000)
         assert mnem == 'LDAA' and mode == 'IMM8'
-        print(f"    ✓ Opcode decoder ({total} opcodes loaded, LDAA #$42 decodes OK)")
+        mem2.load_binary(bytes([0x18, 0xCE, 0x12, 0x34]), 0x1002)  # LDY #$1234
+        mnem, mode, cycles, next_pc = decode_opcode(mem2, 0x1002)
+        assert (mnem, mode, next_pc) == ('LDY', 'IMM16', 0x1004)
+        print(f"    ✓ Opcode decoder ({total} opcodes loaded, LDAA/LDY decode OK)")
     except Exception as e:
         print(f"    ✗ Decoder: {e}")
     
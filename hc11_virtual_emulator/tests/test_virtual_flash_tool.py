@@ -0,0 +1,280 @@
+"""
+HC11 Virtual Emulator — AMD 29F010 Flash Simulator Tool Tests
+
+Command state machine and bulk sector operations for
+tools/virtual_128kb_eeprom.py.
+
+Cross-references:
+  - AMD Am29F010 datasheet (command sequences, DQ6/DQ5 status bits)
+  - tools/virtual_aldl_frame_sender_and_vecu.py (VECU flash consumer)
+"""
+
+import sys
+import os
+import logging
+
+# tools/ is a script directory, not a package
+_TOOLS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools')
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
+
+from virtual_128kb_eeprom import (
+    AMD29F010, BankedFlash, FlashState, FLASH_SIZE, SECTOR_SIZE, NUM_SECTORS,
+)
+
+
+def test_import_leaves_logging_unconfigured():
+    """Importing the module attaches no file/console handlers"""
+    handlers = logging.getLogger("vecu.flash").handlers
+    assert all(isinstance(h, logging.NullHandler) for h in handlers)
+
+
+class TestStateMachine:
+    """AMD command sequences driven through write()/read()."""
+
+    def test_program_sequence(self):
+        """AA/55/A0 then data → PROGRAMMING; next read completes it"""
+        flash = AMD29F010()
+        for addr, value in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0xA0)):
+            flash.write(addr, value)
+        assert flash.state is FlashState.PROGRAM
+        flash.write(0x11234, 0x5A)
+        assert flash.is_busy
+        assert flash.read(0x11234) == 0x5A
+        assert flash.state is FlashState.READ
+
+    def test_status_polling_toggles_dq6(self):
+        """While an operation runs, DQ6 alternates and DQ5 reports a timeout"""
+        flash = AMD29F010()
+        assert flash.program_byte_at(0x0000, 0x00)
+        for addr, value in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0xA0), (0x0001, 0x00)):
+            flash.write(addr, value)
+        flash._program_complete = False  # hold the chip busy
+        assert [flash.read(1) for _ in range(4)] == [0x00, 0x40, 0x00, 0x40]
+        flash._error_flag = True
+        assert [flash.read(1) for _ in range(2)] == [0x20, 0x60]
+        flash._program_complete = True
+        assert flash.read(1) == 0x00 and not flash.is_busy
+
+    def test_broken_unlock_falls_back_to_read(self):
+        flash = AMD29F010()
+        flash.write(0x5555, 0xAA)
+        assert flash.state is FlashState.UNLOCK_1
+        assert flash.read(0x0000) == 0xFF  # array reads still work mid-command
+        flash.write(0x1234, 0x55)
+        assert flash.state is FlashState.READ
+
+    def test_autoselect_reads(self):
+        flash = AMD29F010()
+        for addr, value in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0x90)):
+            flash.write(addr, value)
+        assert [flash.read(a) for a in (0x00, 0x01, 0x4002, 0x03)] == [0x01, 0x20, 0x00, 0x00]
+        flash.write(0, 0xF0)
+        assert flash.state is FlashState.READ
+        assert flash.stats['id_reads'] == 4 and flash.stats['reads'] == 0
+
+    def test_protected_sector_rejects_program_and_erase(self):
+        flash = AMD29F010()
+        flash.set_sector_protect(5)
+        assert flash.sector_protect == [0, 0, 0, 0, 0, 1, 0, 0]
+        assert flash.read_sector_protect_status() == flash.sector_protect
+        assert flash.is_sector_protected(5) and not flash.is_sector_protected(4)
+        assert not flash.program_byte_at(0x14000, 0x00)
+        assert flash.program_byte_at(0x13FFF, 0x00)
+        flash.erase_sector_by_index(5)
+        assert flash.data[0x14000] == 0xFF and flash.stats['sector_erases'] == 0
+        flash.set_sector_protect(5, False)
+        assert flash.sector_protect == [0] * 8
+
+    def test_helpers_match_command_sequences(self):
+        """program_byte_at / erase_sector_by_index == the bus-cycle sequences"""
+        fast, slow = AMD29F010(), AMD29F010()
+        for addr, value in ((0x4000, 0x42), (0x4000, 0xFF), (0x24001, 0x0F)):
+            fast.program_byte_at(addr, value)
+            for a, v in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0xA0), (addr, value)):
+                slow.write(a, v)
+            slow.poll(addr)
+        assert fast.data == slow.data and fast.stats == slow.stats
+        assert fast.data[0x4000:0x4002] == b'\x42\x0F'
+        assert fast.program_byte_at(0x4002, 0xF0)  # F0 is data here, not reset
+        assert fast.erase_sector_by_index(1) and fast.state is FlashState.READ
+        assert fast.verify_sector_erased(1)
+
+    def test_program_bytes_matches_per_byte(self):
+        """Bulk AND over a run straddling sectors 0/1 == byte-at-a-time"""
+        bulk, single = AMD29F010(), AMD29F010()
+        base = SECTOR_SIZE - 3
+        for chunk in (bytes([0x0F, 0xF0, 0x3C, 0xC3, 0x00, 0xFF]), bytes([0xF0] * 6)):
+            assert bulk.program_bytes(base, chunk) == 6
+            for i, b in enumerate(chunk):
+                single.program_byte_at(base + i, b)
+        assert bulk.data == single.data
+        assert bulk.data[base:base + 6] == bytes([0x00, 0xF0, 0x30, 0xC0, 0x00, 0xF0])
+        assert bulk.stats == single.stats
+        assert bulk.stats['program_failures'] == 4
+
+    def test_program_bytes_rejects_range_and_protection(self):
+        flash = AMD29F010()
+        assert flash.program_bytes(FLASH_SIZE - 1, b'\x00\x00') == 0
+        flash.set_sector_protect(1)
+        assert flash.program_bytes(SECTOR_SIZE - 1, b'\x00\x00') == 0
+        assert flash.program_bytes(SECTOR_SIZE - 2, b'\x00\x00') == 2
+        assert flash.data[SECTOR_SIZE - 2:SECTOR_SIZE + 1] == b'\x00\x00\xFF'
+
+    def test_bank_translation(self):
+        """Explicit bank argument and the selected bank agree"""
+        bf = BankedFlash()
+        expect = {0x48: (0x2000, 0x2000), 0x58: (0x8000, 0x10000), 0x50: (0xFFFF, 0x1FFFF)}
+        for bank, (cpu, linear) in expect.items():
+            assert bf.cpu_to_flash_addr(cpu, bank) == linear
+            bf.select_bank(bank)
+            assert bf.cpu_to_flash_addr(cpu) == linear
+        assert not bf.select_bank(0x99) and bf.current_bank == 0x50
+
+    def test_banked_program_bytes(self):
+        """Bank $50 CPU $FFFE maps to flash $1FFFE"""
+        bf = BankedFlash()
+        bf.select_bank(0x50)
+        assert bf.program_bytes(0xFFFE, b'\x12\x34') == 2
+        assert bf.flash.data[0x1FFFE:] == b'\x12\x34'
+
+    def test_write_while_busy_ignored(self):
+        flash = AMD29F010()
+        assert flash.program_byte_at(0x0100, 0x00) is True
+        for addr, value in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0xA0), (0x0101, 0x00)):
+            flash.write(addr, value)
+        flash.write(0x0102, 0x00)  # PROGRAMMING: dropped
+        assert flash.poll(0x0101) == (True, False)
+        assert flash.data[0x0100:0x0103] == b'\x00\x00\xFF'
+
+
+class TestErase:
+    """Sector and chip erase set exactly the targeted bytes to 0xFF."""
+
+    def test_sector_erase_bounded(self):
+        """Erasing sector 1 leaves its neighbours' edge bytes programmed"""
+        flash = AMD29F010(bytearray(FLASH_SIZE))
+        assert flash.erase_sector_by_index(1)
+        assert flash.data[SECTOR_SIZE:2 * SECTOR_SIZE] == b'\xFF' * SECTOR_SIZE
+        assert flash.data[SECTOR_SIZE - 1] == 0x00
+        assert flash.data[2 * SECTOR_SIZE] == 0x00
+        assert len(flash.data) == FLASH_SIZE
+
+    def test_chip_erase_keeps_buffer(self):
+        """Chip erase rewrites the existing bytearray in place"""
+        flash = AMD29F010(bytearray(FLASH_SIZE))
+        data = flash.data
+        for addr, value in ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0x80),
+                            (0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0x10)):
+            flash.write(addr, value)
+        assert flash.poll(0) == (True, False)
+        assert flash.data is data
+        assert data == b'\xFF' * FLASH_SIZE
+        assert flash.stats['chip_erases'] == 1
+
+    def test_sector_helpers(self):
+        """Address bits above 128 KB are ignored; bases are SECTOR_SIZE apart"""
+        assert [AMD29F010.addr_to_sector(a) for a in (0x0000, 0x3FFF, 0x4000, 0x1FFFF, 0x24000)] \
+            == [0, 0, 1, 7, 1]
+        assert [AMD29F010.sector_base(s) for s in range(NUM_SECTORS)] \
+            == [s * SECTOR_SIZE for s in range(NUM_SECTORS)]
+
+    def test_program_then_erase_cycle(self):
+        flash = AMD29F010()
+        assert flash.program_byte_at(0x7FFF, 0x12)
+        assert not flash.verify_sector_erased(1)
+        assert flash.erase_sector_by_index(1)
+        assert all(flash.verify_sector_erased(s) for s in range(NUM_SECTORS))
+
+
+class TestVerify:
+    """verify_data reports the first mismatching flash address."""
+
+    def test_verify_data_match_and_mismatch(self):
+        flash = AMD29F010()
+        flash.data[0x2000:0x2004] = b'\x06\x0A\x00\x00'
+        assert flash.verify_data(0x2000, b'\x06\x0A\x00\x00') == (True, -1)
+        assert flash.verify_data(0x2000, b'\x06\x0A\x01\x00') == (False, 0x2002)
+        assert flash.verify_data(0x2000, b'') == (True, -1)
+
+    def test_verify_data_past_end(self):
+        """Running off the chip fails at FLASH_SIZE unless a byte differs first"""
+        flash = AMD29F010()
+        assert flash.verify_data(FLASH_SIZE - 2, b'\xFF' * 4) == (False, FLASH_SIZE)
+        assert flash.verify_data(FLASH_SIZE - 2, b'\xFF\x00\xFF') == (False, FLASH_SIZE - 1)
+        assert flash.verify_data(FLASH_SIZE + 3, b'\xFF') == (False, FLASH_SIZE + 3)
+
+    def test_checksum_matches_reference_sum(self):
+        """Default window skips $4000-$4007; odd windows clip the same way"""
+        flash = AMD29F010(bytearray(i * 7 & 0xFF for i in range(FLASH_SIZE)))
+
+        def reference(start, end, skip_start, skip_end):
+            total = 0
+            for addr in range(start, min(end, FLASH_SIZE)):
+                if not skip_start <= addr <= skip_end:
+                    total = (total + flash.data[addr]) & 0xFFFF
+            return total
+
+        for args in ((0x2000, 0x20000, 0x4000, 0x4007),
+                     (0x4004, 0x4100, 0x4000, 0x4007),
+                     (0x0000, 0x30000, 0x1FFF0, 0x2FFFF),
+                     (0x5000, 0x6000, 0x4000, 0x4007)):
+            assert flash.compute_checksum(*args) == reference(*args)
+
+
+class TestFileIO:
+    """Loads fill the existing buffer; saves write it without a copy."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        image = bytes(i * 13 & 0xFF for i in range(FLASH_SIZE))
+        src = AMD29F010(bytearray(image))
+        src.save_to_file(str(tmp_path / 'flash.bin'))
+        dst = AMD29F010()
+        data = dst.data
+        dst.load_from_file(str(tmp_path / 'flash.bin'))
+        assert dst.data is data and data == image
+        dst.load_from_bytes(bytes(FLASH_SIZE))
+        assert dst.data is data and data == bytes(FLASH_SIZE)
+
+    def test_wrong_size_rejected(self, tmp_path):
+        (tmp_path / 'short.bin').write_bytes(b'\xFF' * 16)
+        flash = AMD29F010()
+        for load, arg in ((flash.load_from_file, str(tmp_path / 'short.bin')),
+                          (flash.load_from_bytes, b'\xFF' * 16)):
+            try:
+                load(arg)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("short image accepted")
+        assert len(flash.data) == FLASH_SIZE
+
+
+class TestDisplay:
+    """Sector map and statistics text."""
+
+    def test_sector_map_counts_used_bytes(self):
+        flash = AMD29F010()
+        for addr in (0x4000, 0x4001, 0x7FFF):
+            flash.program_byte_at(addr, 0x00)
+        lines = flash.dump_sector_info().splitlines()
+        assert lines[1].endswith("ERASED   (    0/16384 bytes used)")
+        assert lines[2].endswith("WRITTEN  (    3/16384 bytes used)")
+        assert len(lines) == NUM_SECTORS + 1
+
+    def test_stats_snapshot(self):
+        """stats is a fresh dict each time, in dump_stats order"""
+        flash = AMD29F010()
+        flash.program_byte_at(0x0000, 0x7F)
+        flash.read(0x0000)
+        stats = flash.stats
+        assert list(stats) == ['reads', 'programs', 'program_failures',
+                               'sector_erases', 'chip_erases', 'resets', 'id_reads']
+        assert (stats['programs'], stats['reads']) == (1, 1)
+        stats['reads'] = 99
+        assert flash.stats['reads'] == 1
+        assert flash.dump_stats().splitlines()[1:3] == ["  reads: 1", "  programs: 1"]
+        flash.reset_stats()
+        assert set(flash.stats.values()) == {0}
+        assert flash.read(0x0000) == 0x7F and flash.stats['reads'] == 1
@@ -34,9 +34,25 @@ MIT License — Copyright (c) 2026 Jason King (pcmhacking.net: kingaustraliagg)
 from __future__ import annotations
 import sys
 import time
-import argparse
+import os
+import mmap
 import struct
+from bisect import bisect_left
 from pathlib import Path
+from typing import Callable, Iterable
+
+__all__ = [
+    'DEVICE_VX_VY', 'DEVICE_VS_VT', 'DEVICE_VR',
+    'MODE1_DATASTREAM', 'MODE2_READ_RAM', 'MODE8_SILENCE', 'MODE9_UNSILENCE',
+    'READ_BLOCK_SIZE', 'KNOWN_ADDRESSES',
+    'compute_checksum', 'apply_checksum', 'verify_checksum', 'verify_checksums_batch',
+    'verify_capture',
+    'IncrementalChecksum', 'build_mode2_read', 'update_mode2_address',
+    'build_silence_frame', 'build_unsilence_frame',
+    'ALDLSerial', 'LoopbackALDL',
+    'read_ram', 'read_range', 'print_progress', 'silence_bus', 'unsilence_bus',
+    'hex_dump', 'known_addresses_in',
+]
 
 # ═══════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -57,9 +73,11 @@ MODE9_UNSILENCE   = 0x09
 ALDL_BAUD = 8192
 ALDL_LENGTH_OFFSET = 85    # payload_length = frame[1] - 85
 READ_BLOCK_SIZE = 64       # Mode 2 returns 64 bytes per read
-FRAME_SIZE = 201           # Fixed frame buffer size
+FRAME_SIZE = 201           # Max frame size (wire frames are sized exactly)
 DEFAULT_TIMEOUT = 2.0      # seconds
 ECHO_TIMEOUT = 0.5         # seconds
+PROGRESS_INTERVAL = 0.1    # seconds between console progress redraws
+LOOPBACK_FLASH_SIZE = 131072  # 128KB simulated flash
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -67,14 +85,21 @@ ECHO_TIMEOUT = 0.5         # seconds
 # ═══════════════════════════════════════════════════════════════════════
 
 def compute_checksum(frame: bytearray) -> int:
-    """Compute ALDL checksum: two's complement of sum of all bytes mod 256."""
-    return (256 - (sum(frame[:-1]) & 0xFF)) & 0xFF
+    """Compute ALDL checksum: two's complement of sum of all bytes mod 256.
+
+    `frame` includes the checksum slot as its last byte, which is skipped.
+    Sums through a memoryview so no slice copy of the frame is made.
+    """
+    return -sum(memoryview(frame)[:-1]) & 0xFF
 
 
 def apply_checksum(frame: bytearray) -> None:
-    """Apply checksum to the last byte of the frame."""
+    """Apply checksum at the position given by the length byte.
+
+    For frames sized to their wire length that is simply the last byte.
+    """
     cs_pos = frame[1] - 83  # checksum position from length byte
-    frame[cs_pos] = compute_checksum(frame[:cs_pos])
+    frame[cs_pos] = compute_checksum(memoryview(frame)[:cs_pos + 1])
 
 
 def verify_checksum(frame: bytes) -> bool:
@@ -84,10 +109,108 @@ def verify_checksum(frame: bytes) -> bool:
     cs_pos = frame[1] - 83
     if cs_pos < 3 or cs_pos >= len(frame):
         return False
-    expected = compute_checksum(bytearray(frame[:cs_pos]))
+    expected = compute_checksum(memoryview(frame)[:cs_pos + 1])
     return frame[cs_pos] == expected
 
 
+def verify_checksums_batch(frames: Iterable[bytes]) -> list[bool]:
+    """
+    verify_checksum() for many separately captured frames (replay, fuzzing).
+
+    Each frame is checked in place through a memoryview; for one contiguous
+    capture buffer use verify_capture() instead.
+    """
+    results = []
+    append = results.append
+    for frame in frames:
+        n = len(frame)
+        cs_pos = frame[1] - 83 if n >= 3 else -1
+        append(3 <= cs_pos < n and not sum(memoryview(frame)[:cs_pos + 1]) & 0xFF)
+    return results
+
+
+def verify_capture(capture: bytes) -> tuple[int, list[int]]:
+    """
+    Verify every frame in a raw capture of back-to-back ALDL frames.
+
+    Frames are walked in place through one memoryview (each frame's wire
+    length comes from its length byte) and checked by summing the whole
+    frame, checksum included, to 0 mod 256. Stops at the first length byte
+    that cannot start a frame or a frame truncated by the end of capture.
+
+    Returns:
+        (good_count, offsets of frames with a bad checksum)
+    """
+    view = memoryview(capture)
+    end = len(view)
+    pos = good = 0
+    bad: list[int] = []
+    while pos + 3 <= end:
+        wire_len = view[pos + 1] - 82
+        if wire_len < 4 or pos + wire_len > end:
+            break
+        if sum(view[pos:pos + wire_len]) & 0xFF:
+            bad.append(pos)
+        else:
+            good += 1
+        pos += wire_len
+    return good, bad
+
+
+class IncrementalChecksum:
+    """
+    Running ALDL checksum for a frame that is edited a few bytes at a time.
+
+    Holds the byte sum of the frame (mod 256 is all that matters), so each
+    edit costs one add instead of a re-sum of the whole frame. resume()
+    recovers the sum from a frame's existing checksum byte.
+    """
+
+    __slots__ = ('acc',)
+
+    def __init__(self, acc: int = 0):
+        self.acc = acc
+
+    @classmethod
+    def resume(cls, frame: bytearray) -> IncrementalChecksum:
+        """Start from a frame whose checksum is already valid."""
+        return cls(-frame[frame[1] - 83])
+
+    def set_byte(self, frame: bytearray, index: int, value: int) -> None:
+        """Write frame[index] = value, tracking the change in the sum."""
+        self.acc += value - frame[index]
+        frame[index] = value
+
+    @property
+    def checksum(self) -> int:
+        return -self.acc & 0xFF
+
+    def finalize(self, frame: bytearray) -> None:
+        """Store the running checksum in the frame's checksum slot."""
+        frame[frame[1] - 83] = self.checksum
+
+
+def _mode2_template(device_id: int, extended: bool) -> bytearray:
+    """Checksummed Mode 2 read of address 0, built once per device/mode."""
+    key = (device_id, extended)
+    template = _MODE2_TEMPLATES.get(key)
+    if template is None:
+        template = bytearray(7 if extended else 6)
+        template[0] = device_id
+        template[1] = 0x59 if extended else 0x58  # length = 89 / 88
+        template[2] = MODE2_READ_RAM
+        apply_checksum(template)
+        _MODE2_TEMPLATES[key] = template
+    return template
+
+
+_MODE2_TEMPLATES: dict[tuple[int, bool], bytearray] = {}
+
+# Mode byte + address, packed in one call from frame[2]
+_MODE2_ADDR16 = struct.Struct('>BH')
+_MODE2_ADDR24 = struct.Struct('>I')
+
+
 def build_mode2_read(device_id: int, address: int, extended: bool = False) -> bytearray:
     """
     Build an ALDL Mode 2 RAM read request.
@@ -97,27 +220,38 @@ def build_mode2_read(device_id: int, address: int, extended: bool = False) -> by
 
     Frame format:
         [device_id, length_byte, 0x02, addr_hi, addr_lo, ..., checksum]
+
+    The frame is sized to its wire length (6 or 7 bytes), not FRAME_SIZE.
+    It is copied from a cached per-device template and only the address
+    bytes are patched.
     """
-    frame = bytearray(FRAME_SIZE)
-    frame[0] = device_id
-    if extended:
-        frame[1] = 0x59  # length = 89
-        frame[2] = MODE2_READ_RAM
-        frame[3] = (address >> 16) & 0xFF  # bank byte
-        frame[4] = (address >> 8) & 0xFF   # addr high
-        frame[5] = address & 0xFF          # addr low
-    else:
-        frame[1] = 0x58  # length = 88
-        frame[2] = MODE2_READ_RAM
-        frame[3] = (address >> 8) & 0xFF
-        frame[4] = address & 0xFF
-    apply_checksum(frame)
+    frame = bytearray(_mode2_template(device_id, extended))
+    update_mode2_address(frame, address)
     return frame
 
 
+def update_mode2_address(frame: bytearray, address: int) -> None:
+    """
+    Re-point a build_mode2_read() frame at a new address, in place.
+
+    Only the 2-3 address bytes change between consecutive block reads, so
+    the checksum is adjusted by the byte deltas instead of re-summing the
+    frame. Standard vs extended addressing is taken from the length byte.
+    """
+    ck = IncrementalChecksum.resume(frame)
+    addr_bytes = memoryview(frame)[3:frame[1] - 83]
+    ck.acc -= sum(addr_bytes)
+    if frame[1] == 0x59:  # extended 3-byte
+        _MODE2_ADDR24.pack_into(frame, 2, (MODE2_READ_RAM << 24) | (address & 0xFFFFFF))
+    else:
+        _MODE2_ADDR16.pack_into(frame, 2, MODE2_READ_RAM, address & 0xFFFF)
+    ck.acc += sum(addr_bytes)
+    ck.finalize(frame)
+
+
 def build_silence_frame(device_id: int) -> bytearray:
     """Build Mode 8 silence (disable chatter) frame."""
-    frame = bytearray(FRAME_SIZE)
+    frame = bytearray(4)
     frame[0] = device_id
     frame[1] = 0x56
     frame[2] = MODE8_SILENCE
@@ -127,7 +261,7 @@ def build_silence_frame(device_id: int) -> bytearray:
 
 def build_unsilence_frame(device_id: int) -> bytearray:
     """Build Mode 9 unsilence (re-enable chatter) frame."""
-    frame = bytearray(FRAME_SIZE)
+    frame = bytearray(4)
     frame[0] = device_id
     frame[1] = 0x56
     frame[2] = MODE9_UNSILENCE
@@ -147,6 +281,7 @@ class ALDLSerial:
         self.baud = baud
         self.device_id = device_id
         self._serial = None
+        self._rx_buf = bytearray(FRAME_SIZE)  # reused for every response
 
     def open(self):
         """Open the serial port."""
@@ -183,77 +318,94 @@ class ALDLSerial:
         if not self._serial:
             return None
 
-        # Calculate actual wire bytes to send (up to checksum position + 1)
+        # Calculate actual wire bytes to send (up to checksum position + 1).
+        # Builders size frames exactly, so this view is normally the whole
+        # frame; it still guards callers passing a FRAME_SIZE buffer.
         wire_len = frame[1] - 82  # actual bytes on wire
-        tx_data = bytes(frame[:wire_len])
+        tx_data = memoryview(frame)[:wire_len]
 
         self._serial.reset_input_buffer()
         self._serial.write(tx_data)
         self._serial.flush()
 
-        # Consume echo (half-duplex ALDL echoes back our TX)
-        echo_deadline = time.time() + ECHO_TIMEOUT
-        echo_buf = bytearray()
-        while len(echo_buf) < len(tx_data) and time.time() < echo_deadline:
-            remaining = len(tx_data) - len(echo_buf)
-            chunk = self._serial.read(remaining)
-            if chunk:
-                echo_buf.extend(chunk)
+        # Consume echo (half-duplex ALDL echoes back our TX). One blocking
+        # read: pyserial waits for all wire_len bytes or ECHO_TIMEOUT.
+        rx = memoryview(self._rx_buf)
+        self._serial.timeout = ECHO_TIMEOUT
+        self._serial.readinto(rx[:wire_len])
 
         # Wait for response
         self._serial.timeout = timeout
-        # Read first 3 bytes (device_id, length, mode)
-        header = self._serial.read(3)
-        if len(header) < 3:
+        # Read the response into the reused buffer: first 3 bytes
+        # (device_id, length, mode), then the rest of the frame — the
+        # length byte is needed before the body size is known
+        if self._serial.readinto(rx[:3]) < 3:
             return None
 
         # Calculate response length from length byte
-        resp_wire_len = header[1] - 82
+        resp_wire_len = rx[1] - 82
         remaining = resp_wire_len - 3
         if remaining < 0 or remaining > 200:
             return None
 
-        body = self._serial.read(remaining)
-        if len(body) < remaining:
+        if self._serial.readinto(rx[3:resp_wire_len]) < remaining:
             return None
 
-        response = bytes(header) + bytes(body)
-
         # Verify checksum
-        if not verify_checksum(response):
+        if not verify_checksum(rx[:resp_wire_len]):
             print(f"  WARNING: Bad checksum on response")
             return None
 
-        return response
+        return bytes(rx[:resp_wire_len])
 
 
 class LoopbackALDL:
     """
     Loopback transport for testing without hardware.
     Loads a .bin file and serves Mode 2 reads from it.
+
+    ``flash`` is always at least 128KB. A full-size bin is mapped
+    copy-on-write instead of copied; a shorter one is copied into a zeroed
+    128KB buffer. close() drops the mapping and leaves zeroed flash behind.
     """
 
     def __init__(self, bin_path: str | None = None, device_id: int = DEVICE_VX_VY):
         self.device_id = device_id
-        self.flash = bytearray(131072)  # 128KB zeroed
+        self._mm: mmap.mmap | None = None
+        self.flash = bytearray(LOOPBACK_FLASH_SIZE)  # 128KB zeroed
         if bin_path and Path(bin_path).exists():
             with open(bin_path, 'rb') as f:
-                data = f.read()
-            self.flash[:len(data)] = data
-            print(f"  Loaded {len(data)} bytes from {bin_path}")
+                size = os.fstat(f.fileno()).st_size
+                if size >= LOOPBACK_FLASH_SIZE:
+                    # Map the bin copy-on-write: reads come straight from the
+                    # page cache, and writes to self.flash never reach the file
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                    self.flash = self._mm
+                else:
+                    f.readinto(memoryview(self.flash)[:size])
+            print(f"  Loaded {size} bytes from {bin_path}")
+        # Reused Mode 2 response: [id, len, mode, 64 data bytes, checksum]
+        self._resp_mode2 = bytearray(3 + READ_BLOCK_SIZE + 1)
+        self._resp_mode2[0] = device_id
+        self._resp_mode2[1] = 0x55 + READ_BLOCK_SIZE + 1  # length encoding
+        self._resp_mode2[2] = MODE2_READ_RAM
+        self._resp_header_sum = sum(self._resp_mode2[:3])  # constant part
 
     def open(self):
         pass
 
     def close(self):
-        pass
+        if self._mm is not None:
+            self.flash = bytearray(LOOPBACK_FLASH_SIZE)
+            self._mm.close()
+            self._mm = None
 
     def transact(self, frame: bytearray, timeout: float = DEFAULT_TIMEOUT) -> bytes | None:
         """Simulate ECU response for Mode 2 reads."""
         mode = frame[2]
 
         if mode == MODE8_SILENCE or mode == MODE9_UNSILENCE:
-            resp = bytearray([self.device_id, 0x56, mode])
+            resp = bytearray([self.device_id, 0x56, mode, 0])
             apply_checksum(resp)
             return bytes(resp)
 
@@ -264,18 +416,22 @@ class LoopbackALDL:
             else:  # standard 2-byte
                 addr = (frame[3] << 8) | frame[4]
 
-            # Read 64 bytes from simulated flash
+            # Copy 64 bytes of simulated flash straight into the response
+            # (zero-padded past the end of flash)
             end = min(addr + READ_BLOCK_SIZE, len(self.flash))
-            block = self.flash[addr:end]
-            if len(block) < READ_BLOCK_SIZE:
-                block = block + bytes(READ_BLOCK_SIZE - len(block))
-
-            resp = bytearray(FRAME_SIZE)
-            resp[0] = self.device_id
-            resp[1] = 0x55 + len(block) + 1  # length encoding
-            resp[2] = MODE2_READ_RAM
-            resp[3:3 + len(block)] = block
-            apply_checksum(resp)
+            n = max(end - addr, 0)
+            # Only the data needs summing — the header sum is precomputed
+            # and the zero padding adds nothing
+            resp = self._resp_mode2
+            # (release the view promptly so close() can unmap the flash)
+            with memoryview(self.flash) as view:
+                block = view[addr:addr + n]
+                resp[3:3 + n] = block
+                data_sum = sum(block)
+                block.release()
+            if n < READ_BLOCK_SIZE:
+                resp[3 + n:3 + READ_BLOCK_SIZE] = bytes(READ_BLOCK_SIZE - n)
+            resp[-1] = -(self._resp_header_sum + data_sum) & 0xFF
             return bytes(resp)
 
         return None
@@ -292,6 +448,11 @@ def read_ram(transport, address: int, extended: bool = False, device_id: int = D
     Returns the data payload (64 bytes) or None on failure.
     """
     frame = build_mode2_read(device_id, address, extended)
+    return _read_mode2(transport, frame)
+
+
+def _read_mode2(transport, frame: bytearray) -> bytes | None:
+    """Send a prepared Mode 2 frame and extract the data payload."""
     resp = transport.transact(frame)
 
     if resp is None:
@@ -309,16 +470,46 @@ def read_ram(transport, address: int, extended: bool = False, device_id: int = D
     return bytes(resp[3:3 + data_len])
 
 
+_progress_last = 0.0  # time.monotonic() of the last print_progress redraw
+
+
+def print_progress(start: int, length: int, done: int, block: int, total_blocks: int) -> None:
+    """
+    Default read_range progress callback — single updating console line.
+
+    Redraws at most every PROGRESS_INTERVAL seconds; the first and final
+    blocks are always drawn.
+    """
+    global _progress_last
+    now = time.monotonic()
+    final = block == total_blocks
+    if not final and block != 1 and now - _progress_last < PROGRESS_INTERVAL:
+        return
+    _progress_last = now
+    pct = block * 100 // total_blocks
+    sys.stdout.write(f"\r  Reading: ${start:05X}-${start+length-1:05X}  "
+                     f"[{pct:3d}%]  {done}/{length} bytes" + ("\n" if final else ""))
+    sys.stdout.flush()
+
+
 def read_range(transport, start: int, length: int, extended: bool = False,
-               device_id: int = DEVICE_VX_VY) -> bytearray | None:
+               device_id: int = DEVICE_VX_VY,
+               progress: Callable[[int, int, int, int, int], None] | None = print_progress,
+               ) -> bytearray | None:
     """
     Read a range of bytes by issuing multiple Mode 2 reads.
 
+    Blocks are read strictly one at a time: ALDL is a single-wire
+    half-duplex bus with echo, so a second request sent while the ECU is
+    still answering would collide with the response.
+
     Args:
         start:    Starting address
         length:   Total bytes to read
         extended: Use 3-byte addressing
         device_id: ALDL device ID
+        progress: Called as progress(start, length, bytes_done, block,
+                  total_blocks) after each completed block; None for silent
 
     Returns:
         bytearray of all read data, or None on failure
@@ -326,23 +517,26 @@ def read_range(transport, start: int, length: int, extended: bool = False,
     result = bytearray()
     addr = start
     total_blocks = (length + READ_BLOCK_SIZE - 1) // READ_BLOCK_SIZE
+    # One frame for the whole range — only the address bytes are patched
+    frame = build_mode2_read(device_id, start, extended)
 
+    # Every block is taken whole; an unaligned length just overshoots on
+    # the last block and is trimmed once at the end
     for i in range(total_blocks):
-        remaining = length - len(result)
-        data = read_ram(transport, addr, extended, device_id)
+        if i:
+            update_mode2_address(frame, addr)
+        data = _read_mode2(transport, frame)
         if data is None:
             print(f"  Read failed at ${addr:04X} (block {i+1}/{total_blocks})")
             return None
 
-        take = min(len(data), remaining)
-        result.extend(data[:take])
+        result += data
         addr += READ_BLOCK_SIZE
 
-        # Progress
-        pct = (i + 1) * 100 // total_blocks
-        print(f"\r  Reading: ${start:05X}-${start+length-1:05X}  [{pct:3d}%]  {len(result)}/{length} bytes", end="")
+        if progress is not None:
+            progress(start, length, min(len(result), length), i + 1, total_blocks)
 
-    print()  # newline after progress
+    del result[length:]
     return result
 
 
@@ -368,14 +562,18 @@ def unsilence_bus(transport, device_id: int = DEVICE_VX_VY) -> bool:
 # DISPLAY HELPERS
 # ═══════════════════════════════════════════════════════════════════════
 
+# Byte → printable ASCII (non-printables become '.'), for bytes.translate
+_ASCII_TBL = bytes(c if 32 <= c < 127 else 0x2E for c in range(256))
+
+
 def hex_dump(data: bytes, base_addr: int = 0, width: int = 16) -> str:
     """Format data as a hex dump with addresses and ASCII."""
     lines = []
     for i in range(0, len(data), width):
         addr = base_addr + i
         chunk = data[i:i + width]
-        hex_part = ' '.join(f'{b:02X}' for b in chunk)
-        ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
+        hex_part = chunk.hex(' ').upper()
+        ascii_part = chunk.translate(_ASCII_TBL).decode('ascii')
         lines.append(f"  ${addr:05X}: {hex_part:<{width*3}}  {ascii_part}")
     return '\n'.join(lines)
 
@@ -398,12 +596,23 @@ KNOWN_ADDRESSES = {
     0x1FFFF: "RESET vector low byte (extended)",
 }
 
+# Sorted once so range queries are a pair of bisects, not a scan of the dict
+_KNOWN_ADDRESS_KEYS = tuple(sorted(KNOWN_ADDRESSES))
+
+
+def known_addresses_in(start: int, length: int) -> tuple[int, ...]:
+    """KNOWN_ADDRESSES keys in [start, start + length), ascending."""
+    keys = _KNOWN_ADDRESS_KEYS
+    return keys[bisect_left(keys, start):bisect_left(keys, start + length)]
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════
 
 def main():
+    import argparse  # CLI only — not paid for by library imports
+
     parser = argparse.ArgumentParser(
         description="ALDL RAM Reader — Read memory from Delco 68HC11 ECU via ALDL",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -510,20 +719,19 @@ Known VY V6 addresses:
             print()
 
         # Show VY V6 specific info for known addresses
-        if address <= 0x77DE <= address + len(data):
+        hits = known_addresses_in(address, len(data))
+        if 0x77DE in hits and 0x77DF in hits:
             offset = 0x77DE - address
-            if offset + 1 < len(data):
-                rev_hi = data[offset]
-                rev_lo = data[offset + 1]
-                print(f"  Rev Limiter: {rev_hi * 25} / {rev_lo * 25} RPM (high/low)")
-                print()
+            rev_hi = data[offset]
+            rev_lo = data[offset + 1]
+            print(f"  Rev Limiter: {rev_hi * 25} / {rev_lo * 25} RPM (high/low)")
+            print()
 
-        if address <= 0x4006 <= address + len(data):
+        if 0x4006 in hits and 0x4007 in hits:
             offset = 0x4006 - address
-            if offset + 1 < len(data):
-                cs = (data[offset] << 8) | data[offset + 1]
-                print(f"  Checksum at $4006: 0x{cs:04X}")
-                print()
+            cs = (data[offset] << 8) | data[offset + 1]
+            print(f"  Checksum at $4006: 0x{cs:04X}")
+            print()
 
         # Save to file
         if args.output:
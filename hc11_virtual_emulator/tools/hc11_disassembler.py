@@ -32,94 +32,214 @@ Date: February 2026
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+import re
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════
 # INSTRUCTION METADATA
 # ═══════════════════════════════════════════════════════════════════════
 
-# Addressing mode constants
-MODE_IMPLIED   = "imp"
-MODE_IMMEDIATE = "imm"
-MODE_DIRECT    = "dir"
-MODE_EXTENDED  = "ext"
-MODE_INDEXED_X = "idx"
-MODE_INDEXED_Y = "idy"
-MODE_RELATIVE  = "rel"
-MODE_BIT_DIR   = "bit_dir"
-MODE_BIT_IDX   = "bit_idx"
-MODE_BIT_IDY   = "bit_idy"
-MODE_PREFIX    = "prefix"
-MODE_DATA      = "data"
-
-
-@dataclass
+# Addressing mode constants — small ints, so modes fit a byte column and
+# compare/index without hashing. MODE_NAMES[mode] gives the short name.
+(MODE_IMPLIED, MODE_IMMEDIATE, MODE_DIRECT, MODE_EXTENDED, MODE_INDEXED_X,
+ MODE_INDEXED_Y, MODE_RELATIVE, MODE_BIT_DIR, MODE_BIT_IDX, MODE_BIT_IDY,
+ MODE_PREFIX, MODE_DATA) = range(12)
+
+MODE_NAMES = ("imp", "imm", "dir", "ext", "idx", "idy", "rel",
+              "bit_dir", "bit_idx", "bit_idy", "prefix", "data")
+
+
+@dataclass(slots=True, frozen=True)
 class Instruction:
     """HC11 instruction metadata from the opcode table."""
     mnemonic: str
     length: int       # Total bytes including opcode (NOT including prebyte)
     cycles: int
-    mode: str
+    mode: int
     prebyte: int = 0x00
     description: str = ""
 
+    def __post_init__(self):
+        # ~80 distinct mnemonics across 300+ rows: share one string each
+        object.__setattr__(self, "mnemonic", sys.intern(self.mnemonic))
+
     def __str__(self) -> str:
-        return f"{self.mnemonic:6s} ({self.length}B, {self.cycles}cy, {self.mode})"
+        return (f"{self.mnemonic:6s} ({self.length}B, {self.cycles}cy, "
+                f"{MODE_NAMES[self.mode]})")
 
 
-@dataclass
 class DisassembledInstruction:
-    """One decoded instruction with all formatting data."""
-    address: int            # ROM/CPU address
-    raw_bytes: bytes        # All bytes including prebyte
-    mnemonic: str
-    operand_str: str        # Formatted operand (e.g. "#$A4", "$77DE", "$05,X")
-    mode: str               # Addressing mode
-    description: str        # Opcode description
-    cycles: int
-    comment: str = ""       # VY V6 annotation or branch target note
-    length: int = 0         # Total instruction length (set in post-init)
+    """
+    One decoded instruction with all formatting data.
 
-    def __post_init__(self):
-        self.length = len(self.raw_bytes)
+    operand_str and comment may be left as None by the decoder, which then
+    passes the flat opcode index (see _FLAT): they are rendered on first
+    access, so callers that only walk addresses/lengths never pay for
+    formatting. Likewise raw_bytes may be None with the decoded block as
+    source: the instruction's bytes are sliced out of it on first access.
+    """
+    __slots__ = ("address", "_raw_bytes", "mnemonic", "mode", "description",
+                 "cycles", "length", "_operand_str", "_comment", "_index",
+                 "_source", "_start")
+
+    def __init__(self, address: int, raw_bytes: Optional[bytes], mnemonic: str,
+                 operand_str: Optional[str] = None, mode: int = MODE_DATA,
+                 description: str = "", cycles: int = 0,
+                 comment: Optional[str] = "", index: int = 0,
+                 source: Optional[bytes] = None, start: int = 0, length: int = 0):
+        self.address = address          # ROM/CPU address
+        self._raw_bytes = raw_bytes     # All bytes including prebyte
+        self.mnemonic = mnemonic
+        self.mode = mode                # Addressing mode
+        self.description = description  # Opcode description
+        self.cycles = cycles
+        # Total instruction length
+        self.length = len(raw_bytes) if raw_bytes is not None else length
+        self._operand_str = operand_str  # e.g. "#$A4", "$77DE", "$05,X"
+        self._comment = comment          # VY V6 annotation or branch target note
+        self._index = index              # (page_tag << 8) | opcode
+        self._source = source            # decoded block, until raw_bytes is sliced
+        self._start = start
+
+    @property
+    def raw_bytes(self) -> bytes:
+        raw = self._raw_bytes
+        if raw is None:
+            start = self._start
+            raw = self._raw_bytes = self._source[start:start + self.length]
+            self._source = None
+        return raw
+
+    @property
+    def operand_str(self) -> str:
+        if self._operand_str is None:
+            idx = self._index
+            if _PC_RELATIVE[idx]:
+                self._operand_str = _FORMATTER_OF[idx](
+                    self.raw_bytes[1 + (idx > 0xFF):],
+                    self.address + self.length,  # address AFTER instruction
+                )
+            else:
+                self._operand_str = _render_fixed(self.raw_bytes)[0]
+        return self._operand_str
+
+    @property
+    def comment(self) -> str:
+        if self._comment is None:
+            if self.mode == MODE_RELATIVE:
+                idx = self._index
+                self._comment = HC11Disassembler._annotate(
+                    idx, self.raw_bytes[1 + (idx > 0xFF):], self.address + self.length)
+            else:
+                self._comment = _render_fixed(self.raw_bytes)[1]
+        return self._comment
+
+    def _fields(self) -> tuple:
+        return (self.address, self.raw_bytes, self.mnemonic, self.operand_str,
+                self.mode, self.description, self.cycles, self.comment)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"DisassembledInstruction(address={self.address!r}, "
+                f"raw_bytes={self.raw_bytes!r}, mnemonic={self.mnemonic!r}, "
+                f"operand_str={self.operand_str!r}, mode={self.mode!r}, "
+                f"description={self.description!r}, cycles={self.cycles!r}, "
+                f"comment={self.comment!r}, length={self.length!r})")
+
+    @property
+    def mode_name(self) -> str:
+        """Short addressing-mode name, e.g. 'ext' (mode itself is an int)."""
+        return MODE_NAMES[self.mode]
 
     @property
     def hex_str(self) -> str:
         """Hex bytes formatted like 'B6 77 DE'."""
-        return " ".join(f"{b:02X}" for b in self.raw_bytes)
+        return self.raw_bytes.hex(" ").upper()
 
     def format(self, show_description: bool = False, hex_width: int = 14) -> str:
         """Format as a single disassembly line."""
-        addr_s = f"${self.address:04X}"
-        hex_s  = self.hex_str.ljust(hex_width)
-        asm_s  = f"{self.mnemonic} {self.operand_str}".strip()
-        line   = f"{addr_s}: {hex_s} {asm_s}"
-        if self.comment:
-            line += f"  ; {self.comment}"
-        if show_description and self.description and not self.comment:
-            line += f"  ; {self.description}"
-        return line
+        hex_s = self.hex_str
+        if len(hex_s) < hex_width:
+            hex_s = hex_s.ljust(hex_width)
+        asm_s = f"{self.mnemonic} {self.operand_str}" if self.operand_str else self.mnemonic
+        note = self.comment or (self.description if show_description else "")
+        return "".join((f"${self.address:04X}: ", hex_s, " ", asm_s,
+                        f"  ; {note}" if note else ""))
 
     def format_compact(self) -> str:
         """Shorter format for GUI display."""
-        asm = f"{self.mnemonic} {self.operand_str}".strip()
-        cmt = f"  ; {self.comment}" if self.comment else ""
-        return f"${self.address:04X}: {self.hex_str:14s} {asm}{cmt}"
+        return self.format()
+
+
+class DecodedBlock:
+    """
+    A decoded block kept as parallel arrays: instruction start offsets and
+    flat opcode indices. DisassembledInstruction objects are only built
+    when rows are indexed or iterated.
+    """
+    __slots__ = ("data", "base_addr", "offsets", "indices", "_decoder")
+
+    def __init__(self, data: bytes, base_addr: int, offsets: array,
+                 indices: array, decoder: HC11Disassembler):
+        self.data = data
+        self.base_addr = base_addr
+        self.offsets = offsets      # array('L'), offset into data
+        self.indices = indices      # array('H'), (page_tag << 8) | opcode
+        self._decoder = decoder
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.offsets)))]
+        offset = self.offsets[i]
+        return self._decoder._decode_at(self.data, offset, self.indices[i],
+                                        self.base_addr + offset)
+
+    def __iter__(self):
+        decode, data, base_addr = self._decoder._decode_at, self.data, self.base_addr
+        for offset, idx in zip(self.offsets, self.indices):
+            yield decode(data, offset, idx, base_addr + offset)
+
+    def lengths(self) -> array:
+        """Byte length of each instruction (a truncated tail is cut short)."""
+        end = len(self.data)
+        return array('B', (min(_LEN_LUT[idx], end - offset)
+                           for offset, idx in zip(self.offsets, self.indices)))
 
 
 # ═══════════════════════════════════════════════════════════════════════
 # COMPLETE OPCODE TABLES  (224 total: 148 base + 65 page2 + 7 page3 + 4 page4)
 # ═══════════════════════════════════════════════════════════════════════
 
-def _base_opcodes() -> Dict[int, Instruction]:
+def _as_page(entries: Dict[int, Instruction]) -> List[Optional[Instruction]]:
+    """256-slot page indexed by opcode byte (None = undefined) from a table literal."""
+    page: List[Optional[Instruction]] = [None] * 256
+    for op, inst in entries.items():
+        page[op] = inst
+    return page
+
+
+def _base_opcodes() -> List[Optional[Instruction]]:
     """Main (single-byte) opcode map — ~148 entries."""
     I = Instruction
     m = MODE_IMPLIED; i = MODE_IMMEDIATE; d = MODE_DIRECT
     e = MODE_EXTENDED; x = MODE_INDEXED_X; r = MODE_RELATIVE
     bd = MODE_BIT_DIR; bx = MODE_BIT_IDX; p = MODE_PREFIX
-    return {
+    return _as_page({
         # 0x00-0x0F  Miscellaneous / Control
         0x00: I("TEST",  1, 1, m, description="Test mode (factory only)"),
         0x01: I("NOP",   1, 2, m, description="No operation"),
@@ -372,15 +492,15 @@ def _base_opcodes() -> Dict[int, Instruction]:
         0xFD: I("STD",  3, 5, e, description="Store D (ext)"),
         0xFE: I("LDX",  3, 5, e, description="Load X (ext)"),
         0xFF: I("STX",  3, 5, e, description="Store X (ext)"),
-    }
+    })
 
 
-def _page2_opcodes() -> Dict[int, Instruction]:
+def _page2_opcodes() -> List[Optional[Instruction]]:
     """Prebyte 0x18 — Y-register variants (65 entries).
     Length values are the byte count AFTER the 0x18 prefix byte."""
     I = Instruction; y = MODE_INDEXED_Y; by = MODE_BIT_IDY
     m = MODE_IMPLIED; i = MODE_IMMEDIATE; d = MODE_DIRECT; e = MODE_EXTENDED
-    return {
+    return _as_page({
         # Inherent Y ops
         0x08: I("INY",  1, 4, m, 0x18, "Increment Y"),
         0x09: I("DEY",  1, 4, m, 0x18, "Decrement Y"),
@@ -453,14 +573,14 @@ def _page2_opcodes() -> Dict[int, Instruction]:
         0x1D: I("BCLR", 3, 8, by, 0x18, "Clear bits (idy)"),
         0x1E: I("BRSET",4, 8, by, 0x18, "Branch if bits set (idy)"),
         0x1F: I("BRCLR",4, 8, by, 0x18, "Branch if bits clear (idy)"),
-    }
+    })
 
 
-def _page3_opcodes() -> Dict[int, Instruction]:
+def _page3_opcodes() -> List[Optional[Instruction]]:
     """Prebyte 0x1A — CPD modes + CPY/LDY/STY indexed,X (7 entries)."""
     I = Instruction; x = MODE_INDEXED_X
     i = MODE_IMMEDIATE; d = MODE_DIRECT; e = MODE_EXTENDED
-    return {
+    return _as_page({
         0x83: I("CPD",  3, 5, i, 0x1A, "Compare D (imm)"),
         0x93: I("CPD",  2, 6, d, 0x1A, "Compare D (dir)"),
         0xA3: I("CPD",  2, 7, x, 0x1A, "Compare D (idx)"),
@@ -468,18 +588,18 @@ def _page3_opcodes() -> Dict[int, Instruction]:
         0xAC: I("CPY",  2, 7, x, 0x1A, "Compare Y (idx)"),
         0xEE: I("LDY",  2, 6, x, 0x1A, "Load Y (idx)"),
         0xEF: I("STY",  2, 6, x, 0x1A, "Store Y (idx)"),
-    }
+    })
 
 
-def _page4_opcodes() -> Dict[int, Instruction]:
+def _page4_opcodes() -> List[Optional[Instruction]]:
     """Prebyte 0xCD — Y-indexed CPD/CPX/LDX/STX (4 entries)."""
     I = Instruction; y = MODE_INDEXED_Y
-    return {
+    return _as_page({
         0xA3: I("CPD",  2, 7, y, 0xCD, "Compare D (idy)"),
         0xAC: I("CPX",  2, 7, y, 0xCD, "Compare X (idy)"),
         0xEE: I("LDX",  2, 6, y, 0xCD, "Load X (idy)"),
         0xEF: I("STX",  2, 6, y, 0xCD, "Store X (idy)"),
-    }
+    })
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -552,6 +672,34 @@ VY_CODE_LABELS: Dict[int, str] = {
     0xC019: "CME_HANDLER",
 }
 
+# Every 16-bit label above merged into one lookup, built in reverse
+# priority so registers > calibrations > RAM > code win on overlap
+VY_ANNOTATIONS: Dict[int, str] = {
+    **VY_CODE_LABELS,
+    **VY_RAM_LABELS,
+    **{addr: cal[0] for addr, cal in VY_CAL_LABELS.items()},
+    **HC11_REGISTERS,
+}
+
+
+def _dense_labels(table: Dict[int, str]) -> Tuple[array, Tuple[str, ...]]:
+    """
+    Direct-indexed form of a 16-bit label table: a 65536-entry array of
+    indices into a small pool of distinct labels, pool[0] being "".
+    """
+    pool = ("",) + tuple(dict.fromkeys(table.values()))
+    slot_of = {label: i for i, label in enumerate(pool)}
+    index = array('B' if len(pool) <= 0x100 else 'H', [0]) * 0x10000
+    for addr, label in table.items():
+        index[addr] = slot_of[label]
+    return index, pool
+
+
+# One indexed load per lookup instead of a dict probe
+_LABEL_INDEX, _LABEL_POOL = _dense_labels(VY_ANNOTATIONS)
+_CODE_LABEL_INDEX, _CODE_LABEL_POOL = _dense_labels(VY_CODE_LABELS)
+_ZP_RAM_LABELS = tuple(VY_RAM_LABELS.get(addr, "") for addr in range(0x100))
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # DISASSEMBLER ENGINE
@@ -559,6 +707,244 @@ VY_CODE_LABELS: Dict[int, str] = {
 
 PREBYTES = frozenset((0x18, 0x1A, 0xCD))
 
+# Branch offset byte → signed displacement (-128..127)
+_SIGN8 = tuple(array('b', bytes(range(256))))
+
+# Single-byte operand text, preformatted per byte value
+_IMM8_STR = tuple(f"#${b:02X}" for b in range(256))
+_DIR_STR  = tuple(f"${b:02X}" for b in range(256))
+_IDX_STR  = tuple(f"${b:02X},X" for b in range(256))
+_IDY_STR  = tuple(f"${b:02X},Y" for b in range(256))
+
+# Immediate byte → RPM note (25 RPM/count, shown from 1000 RPM up) for the
+# compare/load ops that test engine speed
+_RPM_STR = tuple(f"{v * 25} RPM" if v * 25 >= 1000 else "" for v in range(256))
+_RPM_MNEMONICS = frozenset(("CMPA", "CMPB", "LDAA", "LDAB"))
+_CALL_JUMP_MNEMONICS = frozenset(("JSR", "JMP"))
+
+# Characters _parse_hex ignores between hex digits
+_HEX_SEPARATORS = str.maketrans("", "", " \t\n\r\v\f,;")
+
+
+# ── operand formatters, one per addressing mode: fn(operand_bytes, next_addr) ──
+# Fixed-width hex goes through %-formatting: no per-call format-spec parsing
+
+def _fmt_none(ob: bytes, next_addr: int) -> str:
+    return ""
+
+
+def _fmt_imm8(ob: bytes, next_addr: int) -> str:
+    return _IMM8_STR[ob[0]]
+
+
+def _fmt_imm16(ob: bytes, next_addr: int) -> str:
+    return "#$%04X" % ((ob[0] << 8) | ob[1])
+
+
+def _fmt_dir(ob: bytes, next_addr: int) -> str:
+    return _DIR_STR[ob[0]] if ob else ""
+
+
+def _fmt_ext(ob: bytes, next_addr: int) -> str:
+    return "$%04X" % ((ob[0] << 8) | ob[1]) if len(ob) >= 2 else ""
+
+
+def _fmt_idx(ob: bytes, next_addr: int) -> str:
+    return _IDX_STR[ob[0]] if ob else ""
+
+
+def _fmt_idy(ob: bytes, next_addr: int) -> str:
+    return _IDY_STR[ob[0]] if ob else ""
+
+
+def _fmt_rel(ob: bytes, next_addr: int) -> str:
+    if ob:
+        return "$%04X" % ((next_addr + _SIGN8[ob[0]]) & 0xFFFF)
+    return ""
+
+
+def _bit_set_formatter(index_suffix: str):
+    """BSET/BCLR: operand, mask."""
+    template = "$%02X" + index_suffix + ",#$%02X"
+
+    def fmt(ob: bytes, next_addr: int) -> str:
+        return template % (ob[0], ob[1])
+    return fmt
+
+
+def _bit_branch_formatter(index_suffix: str):
+    """BRSET/BRCLR: operand, mask, branch target."""
+    template = "$%02X" + index_suffix + ",#$%02X,$%04X"
+
+    def fmt(ob: bytes, next_addr: int) -> str:
+        return template % (ob[0], ob[1], (next_addr + _SIGN8[ob[2]]) & 0xFFFF)
+    return fmt
+
+
+# Modes with a single operand layout. Immediate and the bit-manipulation
+# modes depend on operand count and are picked by _specialized_formatter.
+_OPERAND_FORMATTERS = {
+    MODE_IMPLIED:   _fmt_none,
+    MODE_DIRECT:    _fmt_dir,
+    MODE_EXTENDED:  _fmt_ext,
+    MODE_INDEXED_X: _fmt_idx,
+    MODE_INDEXED_Y: _fmt_idy,
+    MODE_RELATIVE:  _fmt_rel,
+    MODE_PREFIX:    _fmt_none,
+    MODE_DATA:      _fmt_none,
+}
+
+# Opcode tables are built once at import and shared by every disassembler
+_BASE_TABLE  = _base_opcodes()
+_PAGE2_TABLE = _page2_opcodes()
+_PAGE3_TABLE = _page3_opcodes()
+_PAGE4_TABLE = _page4_opcodes()
+
+# Page tag per first byte: 0 = base page, 1-3 = prebyte 0x18 / 0x1A / 0xCD.
+# One indexed load answers both "is this a prebyte?" and "which page?", so
+# nothing on the decode path hashes into PREBYTES.
+_PREBYTE_TAG = bytes(sorted(PREBYTES).index(b) + 1 if b in PREBYTES else 0
+                     for b in range(256))
+
+# All four pages in one list indexed by (page_tag << 8) | opcode
+_FLAT: List[Optional[Instruction]] = _BASE_TABLE + _PAGE2_TABLE + _PAGE3_TABLE + _PAGE4_TABLE
+
+# Bytes consumed at each flat index, prebyte included. Undefined opcodes and
+# bare prefixes are 1-byte (base) / 2-byte (paged) DB entries, as in decode_one.
+_LEN_LUT = bytes(
+    (idx >> 8 > 0) + (inst.length if inst is not None and inst.mode != MODE_PREFIX else 1)
+    for idx, inst in enumerate(_FLAT)
+)
+
+# Per-field columns over _FLAT, read by the decoder in place of the
+# Instruction rows. Undefined opcodes and bare prefixes have _MNE None.
+_MNE: Tuple[Optional[str], ...] = tuple(
+    inst.mnemonic if inst is not None and inst.mode != MODE_PREFIX else None
+    for inst in _FLAT)
+_MODE = bytes(inst.mode if inst is not None else MODE_DATA for inst in _FLAT)
+_CYC = bytes(inst.cycles if inst is not None else 0 for inst in _FLAT)
+_DESC: Tuple[str, ...] = tuple(inst.description if inst is not None else "" for inst in _FLAT)
+
+# Annotation flags per flat index, so _annotate never compares mnemonics:
+# JSR/JMP (extended target is a code label) and immediate RPM compares/loads
+_IS_JSR_JMP = bytes(mne in _CALL_JUMP_MNEMONICS for mne in _MNE)
+_IS_RPM_OP = bytes(mne in _RPM_MNEMONICS and mode == MODE_IMMEDIATE
+                   for mne, mode in zip(_MNE, _MODE))
+
+
+# Longest instruction, prebyte included (5: prebyte + opcode + 3 for BRSET,Y)
+_MAX_INST_LEN = max(_LEN_LUT)
+
+# Base-page step per byte, for bytes.translate; prebyte positions are then
+# patched with their paged length (a bare trailing prebyte stays 1)
+_BASE_STEP = _LEN_LUT[:256]
+_PREBYTE_RE = re.compile(b"[" + re.escape(bytes(sorted(PREBYTES))) + b"]")
+
+
+def _instruction_starts(data: bytes) -> array:
+    """
+    Instruction start offsets only, as an array('L').
+
+    The per-byte step lengths come from one C-level translate of the whole
+    block plus a fix-up per prebyte, so the Python loop that remains just
+    chains offset += step.
+    """
+    end = len(data)
+    steps = bytearray(data.translate(_BASE_STEP))
+    for m in _PREBYTE_RE.finditer(data, 0, end - 1):
+        p = m.start()
+        steps[p] = _LEN_LUT[(_PREBYTE_TAG[data[p]] << 8) | data[p + 1]]
+    offsets = array('L')
+    add_offset = offsets.append
+    offset = 0
+    while offset < end:
+        add_offset(offset)
+        offset += steps[offset]
+    return offsets
+
+
+def _decode_block(data: bytes, limit: int = 0) -> Tuple[array, array]:
+    """
+    Integer-only decode pass over a block: instruction start offsets and
+    their flat opcode indices, as parallel arrays.
+
+    A prebyte in the last position keeps its base-page index (a bare
+    prefix, decoded as DB). Formatting is left to the caller, so only the
+    instructions actually rendered pay for it. limit > 0 stops after that
+    many instructions.
+    """
+    if limit > 0:
+        # limit instructions never reach past limit * _MAX_INST_LEN bytes
+        data = data[:limit * _MAX_INST_LEN]
+    offsets = _instruction_starts(data)
+    if limit > 0:
+        del offsets[limit:]
+    count = len(offsets)
+    indices = array('H')
+    if not count:
+        return offsets, indices
+
+    # Gather each instruction's first byte in C, widen to uint16 in place,
+    # then only the prebyte-led instructions need their paged index
+    if count > 1:
+        first = bytes(itemgetter(*offsets)(data))
+    else:
+        first = data[:1]
+    wide = bytearray(2 * count)
+    wide[sys.byteorder == "big"::2] = first
+    indices.frombytes(wide)
+    last = len(data) - 1
+    for m in _PREBYTE_RE.finditer(first):
+        k = m.start()
+        offset = offsets[k]
+        if offset < last:
+            indices[k] = (_PREBYTE_TAG[first[k]] << 8) | data[offset + 1]
+    return offsets, indices
+
+
+_BIT_SUFFIX = {MODE_BIT_DIR: "", MODE_BIT_IDX: ",X", MODE_BIT_IDY: ",Y"}
+_BIT_SET_FORMATTERS = {m: _bit_set_formatter(sfx) for m, sfx in _BIT_SUFFIX.items()}
+_BIT_BRANCH_FORMATTERS = {m: _bit_branch_formatter(sfx) for m, sfx in _BIT_SUFFIX.items()}
+
+
+def _specialized_formatter(inst: Optional[Instruction]):
+    """
+    Operand formatter fixed for one opcode: the operand count is known from
+    the table, so imm8/imm16 and BSET/BRSET forms skip the length checks.
+    """
+    if inst is None:
+        return _fmt_none
+    operand_count = inst.length - 1
+    if inst.mode == MODE_IMMEDIATE:
+        return _fmt_imm8 if operand_count == 1 else _fmt_imm16
+    if inst.mode in _BIT_SUFFIX:
+        table = _BIT_SET_FORMATTERS if operand_count == 2 else _BIT_BRANCH_FORMATTERS
+        return table[inst.mode]
+    return _OPERAND_FORMATTERS[inst.mode]
+
+
+# Per flat index: the specialized formatter, and whether its text embeds a
+# branch target (BRA/Bcc/BSR, BRSET/BRCLR) — everything else renders the
+# same at any address
+_FORMATTER_OF = tuple(_specialized_formatter(inst) for inst in _FLAT)
+_PC_RELATIVE = bytes(fmt is _fmt_rel or fmt in _BIT_BRANCH_FORMATTERS.values()
+                     for fmt in _FORMATTER_OF)
+
+
+@lru_cache(maxsize=8192)
+def _render_fixed(raw: bytes) -> Tuple[str, str]:
+    """
+    Operand text and annotation for a decoded, non-PC-relative instruction.
+
+    Both depend only on the instruction bytes, so padding, erased flash and
+    repeated loads/stores across a ROM are formatted once.
+    """
+    tag = _PREBYTE_TAG[raw[0]]
+    idx = (tag << 8) | raw[1] if tag else raw[0]
+    ob = raw[1 + (tag != 0):]
+    return (_FORMATTER_OF[idx](ob, 0),
+            HC11Disassembler._annotate(idx, ob, 0))
+
 
 class HC11Disassembler:
     """
@@ -573,30 +959,54 @@ class HC11Disassembler:
 
     def __init__(self, annotate_vy: bool = True):
         self.annotate_vy = annotate_vy
-        self._base   = _base_opcodes()
-        self._page2  = _page2_opcodes()
-        self._page3  = _page3_opcodes()
-        self._page4  = _page4_opcodes()
+        self._base   = _BASE_TABLE
+        self._page2  = _PAGE2_TABLE
+        self._page3  = _PAGE3_TABLE
+        self._page4  = _PAGE4_TABLE
 
     # ── public API ──
 
     def disassemble(self, data: bytes, base_addr: int = 0,
                     max_instructions: int = 0) -> List[DisassembledInstruction]:
         """Disassemble a block of bytes. Returns list of DisassembledInstruction."""
+        return list(self.disassemble_raw(data, base_addr, max_instructions))
+
+    def iter_disassemble(self, data: bytes, base_addr: int = 0,
+                         max_instructions: int = 0) -> Iterator[DisassembledInstruction]:
+        """
+        Yield instructions one at a time, for single-pass consumers.
+
+        Nothing is accumulated — no result list and no offset arrays — so
+        peak memory stays flat however large the ROM image is.
+        """
         data = bytes(data)
-        results: List[DisassembledInstruction] = []
+        decode = self._decode_at
+        end = len(data)
+        last = end - 1
         offset = 0
         count = 0
-        while offset < len(data):
-            inst = self.decode_one(data, offset, base_addr + offset)
-            if inst is None:
-                break
-            results.append(inst)
-            offset += inst.length
+        while offset < end:
+            idx = data[offset]
+            tag = _PREBYTE_TAG[idx]
+            if tag and offset < last:
+                idx = (tag << 8) | data[offset + 1]
+            yield decode(data, offset, idx, base_addr + offset)
             count += 1
-            if max_instructions and count >= max_instructions:
-                break
-        return results
+            if count == max_instructions:
+                return
+            offset += _LEN_LUT[idx]
+
+    def disassemble_raw(self, data: bytes, base_addr: int = 0,
+                        max_instructions: int = 0) -> DecodedBlock:
+        """
+        Decode a block without building result objects up front.
+
+        Callers that only need addresses/lengths read the arrays on the
+        returned DecodedBlock; rows are materialized on indexing/iteration.
+        """
+        data = bytes(data)
+        offsets, indices = _decode_block(data, max_instructions)
+        return DecodedBlock(data, base_addr, offsets, indices, self)
 
     def disassemble_hex(self, hex_string: str, base_addr: int = 0,
                         max_instructions: int = 0) -> List[DisassembledInstruction]:
@@ -609,194 +1019,95 @@ class HC11Disassembler:
         """Decode exactly one instruction at the given offset."""
         if offset >= len(data):
             return None
+        if not isinstance(data, bytes):
+            # Result slices its bytes lazily: snapshot a window it can own
+            data, offset = bytes(data[offset: offset + _MAX_INST_LEN]), 0
 
-        opcode = data[offset]
-        prebyte = 0x00
-        table = self._base
-        prefix_len = 0
+        idx = data[offset]
 
         # Handle prebyte pages
-        if opcode in PREBYTES:
+        tag = _PREBYTE_TAG[idx]
+        if tag:
             if offset + 1 >= len(data):
                 return self._make_db(data, offset, base_addr, 1)
-            prebyte = opcode
-            opcode = data[offset + 1]
-            prefix_len = 1
-            if prebyte == 0x18:
-                table = self._page2
-            elif prebyte == 0x1A:
-                table = self._page3
-            elif prebyte == 0xCD:
-                table = self._page4
-
-        inst_meta = table.get(opcode)
-        if inst_meta is None or inst_meta.mode == MODE_PREFIX:
+            idx = (tag << 8) | data[offset + 1]
+
+        return self._decode_at(data, offset, idx, base_addr)
+
+    def _decode_at(self, data: bytes, offset: int, idx: int,
+                   base_addr: int) -> DisassembledInstruction:
+        """Build the result for flat opcode index idx found at offset."""
+        mnemonic = _MNE[idx]
+        total_len = _LEN_LUT[idx]
+        if mnemonic is None:
             # Unknown opcode or bare prefix — emit as DB
-            return self._make_db(data, offset, base_addr, 1 + prefix_len)
+            return self._make_db(data, offset, base_addr, total_len)
 
-        total_len = prefix_len + inst_meta.length
         if offset + total_len > len(data):
             return self._make_db(data, offset, base_addr, len(data) - offset)
 
-        raw = bytes(data[offset: offset + total_len])
-        # Operand bytes are everything after the opcode (and prebyte)
-        operand_start = prefix_len + 1
-        operand_bytes = raw[operand_start:]
-
-        operand_str = self._format_operand(
-            inst_meta.mnemonic, inst_meta.mode, operand_bytes,
-            base_addr + total_len,  # address AFTER instruction (for rel branches)
+        # Raw bytes, operand text and annotation are all produced lazily.
+        # Positional in __init__ order: this runs once per decoded instruction.
+        return DisassembledInstruction(
+            base_addr, None, mnemonic, None, _MODE[idx], _DESC[idx], _CYC[idx],
+            None if self.annotate_vy else "", idx,
+            data, offset, total_len,
         )
 
-        comment = self._annotate(inst_meta, operand_bytes, base_addr) if self.annotate_vy else ""
+    def instruction_offsets(self, data: bytes) -> List[int]:
+        """
+        Offsets at which disassemble() would start each instruction.
 
-        return DisassembledInstruction(
-            address=base_addr,
-            raw_bytes=raw,
-            mnemonic=inst_meta.mnemonic,
-            operand_str=operand_str,
-            mode=inst_meta.mode,
-            description=inst_meta.description,
-            cycles=inst_meta.cycles,
-            comment=comment,
-        )
+        Walks the block using only the precomputed length table — no operand
+        formatting or result objects — for callers that just need boundaries.
+        """
+        return _instruction_starts(bytes(data)).tolist()
 
     def get_stats(self) -> Dict[str, int]:
+        base, page2, page3, page4 = (256 - t.count(None) for t in
+                                     (self._base, self._page2, self._page3, self._page4))
         return {
-            "base": len(self._base),
-            "page2_0x18": len(self._page2),
-            "page3_0x1A": len(self._page3),
-            "page4_0xCD": len(self._page4),
-            "total": len(self._base) + len(self._page2) + len(self._page3) + len(self._page4),
+            "base": base,
+            "page2_0x18": page2,
+            "page3_0x1A": page3,
+            "page4_0xCD": page4,
+            "total": base + page2 + page3 + page4,
         }
 
-    # ── operand formatting ──
-
-    @staticmethod
-    def _format_operand(mnemonic: str, mode: str, operand_bytes: bytes,
-                        next_addr: int) -> str:
-        """Format the operand string for a given addressing mode."""
-        ob = operand_bytes
-        if mode == MODE_IMPLIED:
-            return ""
-        if mode == MODE_IMMEDIATE:
-            if len(ob) == 1:
-                return f"#${ob[0]:02X}"
-            if len(ob) == 2:
-                return f"#${(ob[0] << 8) | ob[1]:04X}"
-            return ""
-        if mode == MODE_DIRECT:
-            return f"${ob[0]:02X}" if ob else ""
-        if mode == MODE_EXTENDED:
-            if len(ob) >= 2:
-                return f"${(ob[0] << 8) | ob[1]:04X}"
-            return ""
-        if mode == MODE_INDEXED_X:
-            return f"${ob[0]:02X},X" if ob else ""
-        if mode == MODE_INDEXED_Y:
-            return f"${ob[0]:02X},Y" if ob else ""
-        if mode == MODE_RELATIVE:
-            if ob:
-                rel = ob[0] if ob[0] < 128 else ob[0] - 256
-                target = next_addr + rel
-                return f"${target & 0xFFFF:04X}"
-            return ""
-        if mode == MODE_BIT_DIR:
-            if len(ob) == 2:
-                return f"${ob[0]:02X},#${ob[1]:02X}"
-            if len(ob) == 3:
-                rel = ob[2] if ob[2] < 128 else ob[2] - 256
-                target = next_addr + rel
-                return f"${ob[0]:02X},#${ob[1]:02X},${target & 0xFFFF:04X}"
-            return ""
-        if mode == MODE_BIT_IDX:
-            if len(ob) == 2:
-                return f"${ob[0]:02X},X,#${ob[1]:02X}"
-            if len(ob) == 3:
-                rel = ob[2] if ob[2] < 128 else ob[2] - 256
-                target = next_addr + rel
-                return f"${ob[0]:02X},X,#${ob[1]:02X},${target & 0xFFFF:04X}"
-            return ""
-        if mode == MODE_BIT_IDY:
-            if len(ob) == 2:
-                return f"${ob[0]:02X},Y,#${ob[1]:02X}"
-            if len(ob) == 3:
-                rel = ob[2] if ob[2] < 128 else ob[2] - 256
-                target = next_addr + rel
-                return f"${ob[0]:02X},Y,#${ob[1]:02X},${target & 0xFFFF:04X}"
-            return ""
-        return ""
-
     # ── VY V6 annotation ──
 
-    def _annotate(self, inst: Instruction, operand_bytes: bytes,
-                  addr: int) -> str:
+    @staticmethod
+    def _annotate(idx: int, operand_bytes: bytes, next_addr: int) -> str:
         """Generate VY V6 annotation comment for known addresses."""
-        parts: List[str] = []
-        mode = inst.mode
+        mode = _MODE[idx]
         ob = operand_bytes
-
-        # Extended mode — full 16-bit address
-        if mode == MODE_EXTENDED and len(ob) >= 2:
+        # Modes are exclusive: one branch per instruction, each effective
+        # address / branch target computed once
+        if mode == MODE_EXTENDED:
+            if len(ob) < 2:
+                return ""
             ea = (ob[0] << 8) | ob[1]
-            lbl = self._label_for(ea)
-            if lbl:
-                parts.append(lbl)
+            lbl = _LABEL_POOL[_LABEL_INDEX[ea]]
+            # JSR/JMP targets — annotate known code labels
+            code_lbl = _CODE_LABEL_POOL[_CODE_LABEL_INDEX[ea]] if _IS_JSR_JMP[idx] else ""
+            if not code_lbl:
+                return lbl
+            return f"{lbl} | → {code_lbl}" if lbl else f"→ {code_lbl}"
 
         # Direct mode — zero-page ($00xx)
-        elif mode == MODE_DIRECT and ob:
-            ea = ob[0]
-            lbl = VY_RAM_LABELS.get(ea)
-            if lbl:
-                parts.append(lbl)
-
-        # Branch / BSR / JSR targets — annotate known code labels
-        if mode == MODE_RELATIVE and ob:
-            rel = ob[0] if ob[0] < 128 else ob[0] - 256
-            # next_addr = addr + inst.length + prefix overhead already included
-            # but we get the base_addr here, not next_addr. Recalculate:
-            prefix_len = 1 if inst.prebyte else 0
-            next_addr = addr + prefix_len + inst.length
-            target = (next_addr + rel) & 0xFFFF
-            lbl = VY_CODE_LABELS.get(target)
-            if lbl:
-                parts.append(f"→ {lbl}")
-
-        if mode == MODE_EXTENDED and len(ob) >= 2:
-            ea = (ob[0] << 8) | ob[1]
-            if inst.mnemonic in ("JSR", "JMP"):
-                lbl = VY_CODE_LABELS.get(ea)
-                if lbl:
-                    parts.append(f"→ {lbl}")
-
-        # RPM comparison annotation
-        if inst.mnemonic in ("CMPA", "CMPB", "LDAA", "LDAB") and mode == MODE_IMMEDIATE and ob:
-            val = ob[0]
-            rpm = val * 25
-            if rpm >= 1000:
-                parts.append(f"{rpm} RPM")
+        if mode == MODE_DIRECT:
+            return _ZP_RAM_LABELS[ob[0]] if ob else ""
 
-        return " | ".join(parts)
+        # Branch / BSR targets — annotate known code labels
+        if mode == MODE_RELATIVE:
+            if not ob:
+                return ""
+            lbl = _CODE_LABEL_POOL[_CODE_LABEL_INDEX[(next_addr + _SIGN8[ob[0]]) & 0xFFFF]]
+            return f"→ {lbl}" if lbl else ""
 
-    @staticmethod
-    def _label_for(addr: int) -> str:
-        """Look up a human label for a 16-bit address."""
-        # HC11 registers
-        reg = HC11_REGISTERS.get(addr)
-        if reg:
-            return reg
-        # Calibration scalars
-        cal = VY_CAL_LABELS.get(addr)
-        if cal:
-            return cal[0]
-        # RAM variables (extended addressing hits $00xx)
-        ram = VY_RAM_LABELS.get(addr)
-        if ram:
-            return ram
-        # Code labels
-        code = VY_CODE_LABELS.get(addr)
-        if code:
-            return code
+        # RPM comparison annotation
+        if _IS_RPM_OP[idx] and ob:
+            return _RPM_STR[ob[0]]
         return ""
 
     # ── helpers ──
@@ -806,7 +1117,7 @@ class HC11Disassembler:
                  count: int) -> DisassembledInstruction:
         """Create a DB (data byte) pseudo-instruction for unknown bytes."""
         raw = bytes(data[offset: offset + count])
-        hex_vals = " ".join(f"${b:02X}" for b in raw)
+        hex_vals = " ".join([_DIR_STR[b] for b in raw])
         return DisassembledInstruction(
             address=base_addr,
             raw_bytes=raw,
@@ -819,20 +1130,17 @@ class HC11Disassembler:
         )
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _parse_hex(hex_string: str) -> bytes:
         """Parse flexible hex input: 'B6 77DE', 'B6,77,DE', '0xB6 0x77 0xDE', etc."""
-        s = hex_string.strip()
-        # Remove common prefixes/separators
-        s = s.replace("0x", "").replace("0X", "")
-        s = s.replace(",", " ").replace(";", " ").replace("\n", " ").replace("\t", " ")
-        # If no spaces → treat as continuous hex
-        tokens = s.split()
-        if not tokens:
-            return b""
-        if len(tokens) == 1 and len(tokens[0]) > 2:
-            # Continuous hex like "B677DE39"
-            return bytes.fromhex(tokens[0])
-        return bytes.fromhex("".join(tokens))
+        # Plain hex, continuous or space-separated by byte: fromhex takes it as is
+        try:
+            return bytes.fromhex(hex_string)
+        except ValueError:
+            pass
+        # Drop separators/whitespace in one pass, then the 0x prefixes
+        s = hex_string.translate(_HEX_SEPARATORS)
+        return bytes.fromhex(s.replace("0x", "").replace("0X", ""))
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -867,7 +1175,7 @@ if __name__ == "__main__":
     print(f"Input hex: {test_hex}")
     print(f"Base addr: $8000")
     print("-" * 72)
-    for r in dis.disassemble_hex(test_hex, base_addr=0x8000):
+    for r in dis.iter_disassemble(bytes.fromhex(test_hex), base_addr=0x8000):
         print(r.format(show_description=True))
     print()
 
@@ -876,5 +1184,5 @@ if __name__ == "__main__":
     print(f"Input hex: {test2}")
     print(f"Base addr: $C000")
     print("-" * 72)
-    for r in dis.disassemble_hex(test2, base_addr=0xC000):
+    for r in dis.iter_disassemble(bytes.fromhex(test2), base_addr=0xC000):
         print(r.format(show_description=True))
@@ -34,12 +34,11 @@ import logging
 import sys
 from pathlib import Path
 from datetime import datetime
-from enum import Enum, auto
+from enum import IntEnum
 from typing import Optional, List, Tuple
 
 # ── Logging Setup (merged from ignore/log_setup.py — same pattern as kingai_commie_flasher.py) ──
 LOG_DIR = Path(__file__).resolve().parent / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 try:
     from rich.logging import RichHandler
@@ -64,14 +63,14 @@ def setup_logging(
 
     Log files: ``<log_dir>/<name>_YYYYMMDD_HHMMSS.log``
     """
-    log_dir = log_dir or LOG_DIR
-    log_dir.mkdir(parents=True, exist_ok=True)
-
     logger = logging.getLogger(name)
-    if logger.handlers:
+    if any(not isinstance(h, logging.NullHandler) for h in logger.handlers):
         return logger
     logger.setLevel(level)
 
+    log_dir = log_dir or LOG_DIR
+    log_dir.mkdir(parents=True, exist_ok=True)
+
     # ── File handler: captures everything (DEBUG+) ──
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = log_dir / f"{name}_{ts}.log"
@@ -112,7 +111,10 @@ def setup_logging(
     return logger
 
 
-log = setup_logging()
+# Library logger: silent until an application configures it (setup_logging()
+# here, or the VECU's "vecu" logger, which this one propagates to).
+log = logging.getLogger("vecu.flash")
+log.addHandler(logging.NullHandler())
 
 # ═══════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -123,6 +125,9 @@ SECTOR_SIZE = 16384            # 16KB
 NUM_SECTORS = 8                # 8 x 16KB = 128KB
 ERASED_BYTE = 0xFF             # NOR flash erased state
 
+_ADDR_MASK = FLASH_SIZE - 1    # 0x1FFFF — 17-bit chip address
+_SECTOR_SHIFT = 14             # SECTOR_SIZE == 1 << 14
+
 # AMD 29F010 software ID
 MANUFACTURER_ID = 0x01         # AMD
 DEVICE_ID = 0x20               # Am29F010
@@ -148,23 +153,34 @@ SECTOR_BASES = [i * SECTOR_SIZE for i in range(NUM_SECTORS)]
 SECTOR_PROTECT_UNPROTECTED = 0x00
 SECTOR_PROTECT_PROTECTED = 0x01
 
+# Autoselect read value by low address byte ($02, sector protect, is per-sector)
+_AUTOSELECT_IDS = bytes([MANUFACTURER_ID, DEVICE_ID]) + bytes(254)
+
+# Erased-state templates — one slice assignment instead of a per-byte loop
+_ERASED_SECTOR = bytes([ERASED_BYTE]) * SECTOR_SIZE
+_ERASED_CHIP = bytes([ERASED_BYTE]) * FLASH_SIZE
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # FLASH STATE MACHINE
 # ═══════════════════════════════════════════════════════════════════════
 
-class FlashState(Enum):
-    """AMD 29F010 internal state machine."""
-    READ = auto()           # Normal read array mode
-    UNLOCK_1 = auto()       # Got AA→5555, waiting for 55→2AAA
-    UNLOCK_2 = auto()       # Got 55→2AAA, waiting for command byte
-    AUTOSELECT = auto()     # Software ID mode (reads return mfg/device)
-    PROGRAM = auto()        # Waiting for program data byte
-    ERASE_SETUP = auto()    # Got 80, waiting for second unlock sequence
-    ERASE_UNLOCK_1 = auto() # Got AA→5555 (second), waiting for 55→2AAA
-    ERASE_UNLOCK_2 = auto() # Got 55→2AAA (second), waiting for 30/10
-    PROGRAMMING = auto()    # Byte program in progress (toggle bit)
-    ERASING = auto()        # Sector/chip erase in progress (toggle bit)
+class FlashState(IntEnum):
+    """AMD 29F010 internal state machine.
+
+    Values are contiguous from 0 so a state indexes the dispatch lists
+    directly; the two busy states are numbered last (see is_busy).
+    """
+    READ = 0                # Normal read array mode
+    UNLOCK_1 = 1            # Got AA→5555, waiting for 55→2AAA
+    UNLOCK_2 = 2            # Got 55→2AAA, waiting for command byte
+    AUTOSELECT = 3          # Software ID mode (reads return mfg/device)
+    PROGRAM = 4             # Waiting for program data byte
+    ERASE_SETUP = 5         # Got 80, waiting for second unlock sequence
+    ERASE_UNLOCK_1 = 6      # Got AA→5555 (second), waiting for 55→2AAA
+    ERASE_UNLOCK_2 = 7      # Got 55→2AAA (second), waiting for 30/10
+    PROGRAMMING = 8         # Byte program in progress (toggle bit)
+    ERASING = 9             # Sector/chip erase in progress (toggle bit)
 
 
 class AMD29F010:
@@ -200,24 +216,35 @@ class AMD29F010:
             self._data = bytearray(initial_data)
         else:
             # Start fully erased
-            self._data = bytearray(b'\xFF' * FLASH_SIZE)
+            self._data = bytearray(_ERASED_CHIP)
 
         self._state = FlashState.READ
-        self._sector_protect = [SECTOR_PROTECT_UNPROTECTED] * NUM_SECTORS
-        self._toggle_bit = False      # DQ6 toggle for polling
+        self._prot_mask = 0           # bit N set = sector N protected
+        self._toggle = 0              # DQ6 toggle for polling (0x00/0x40)
         self._program_complete = True # DQ6 stops toggling when done
         self._error_flag = False      # DQ5 timeout exceeded
 
-        # Statistics
-        self.stats = {
-            'reads': 0,
-            'programs': 0,
-            'program_failures': 0,   # Tried to set bit 0→1
-            'sector_erases': 0,
-            'chip_erases': 0,
-            'resets': 0,
-            'id_reads': 0,
+        # State → handler tables: one list index per bus cycle instead of an elif chain
+        S = FlashState
+        read_handlers = {
+            S.READ: self._r_array, S.UNLOCK_1: self._r_array,
+            S.UNLOCK_2: self._r_array, S.AUTOSELECT: self._r_autoselect,
+            S.PROGRAM: self._r_array, S.ERASE_SETUP: self._r_array,
+            S.ERASE_UNLOCK_1: self._r_array, S.ERASE_UNLOCK_2: self._r_array,
+            S.PROGRAMMING: self._r_status, S.ERASING: self._r_status,
+        }
+        write_handlers = {
+            S.READ: self._w_read, S.UNLOCK_1: self._w_unlock_1,
+            S.UNLOCK_2: self._w_unlock_2, S.AUTOSELECT: self._w_read,
+            S.PROGRAM: self._program_byte, S.ERASE_SETUP: self._w_erase_setup,
+            S.ERASE_UNLOCK_1: self._w_erase_unlock_1,
+            S.ERASE_UNLOCK_2: self._w_erase_unlock_2,
+            S.PROGRAMMING: self._w_busy, S.ERASING: self._w_busy,
         }
+        self._read_dispatch = [read_handlers[st] for st in S]
+        self._write_dispatch = [write_handlers[st] for st in S]
+
+        self.reset_stats()
 
         log.info("AMD 29F010 initialized (%d bytes, %d sectors)", FLASH_SIZE, NUM_SECTORS)
 
@@ -235,45 +262,84 @@ class AMD29F010:
     @property
     def is_busy(self) -> bool:
         """True if programming or erasing in progress."""
-        return self._state in (FlashState.PROGRAMMING, FlashState.ERASING)
+        return self._state >= FlashState.PROGRAMMING
+
+    @property
+    def sector_protect(self) -> List[int]:
+        """Per-sector protect bytes (SECTOR_PROTECT_*), unpacked from the mask."""
+        return [(self._prot_mask >> s) & 1 for s in range(NUM_SECTORS)]
+
+    def reset_stats(self) -> None:
+        """Zero the operation counters (plain ints — see the stats property)."""
+        self._n_reads = 0
+        self._n_programs = 0
+        self._n_program_failures = 0   # Tried to set bit 0→1
+        self._n_sector_erases = 0
+        self._n_chip_erases = 0
+        self._n_resets = 0
+        self._n_id_reads = 0
+
+    @property
+    def stats(self) -> dict:
+        """Operation counters, built on demand from the per-op ints."""
+        return {
+            'reads': self._n_reads,
+            'programs': self._n_programs,
+            'program_failures': self._n_program_failures,
+            'sector_erases': self._n_sector_erases,
+            'chip_erases': self._n_chip_erases,
+            'resets': self._n_resets,
+            'id_reads': self._n_id_reads,
+        }
 
     # ── File I/O ──
 
+    # Loads fill the existing buffer in place: no intermediate copy, and
+    # references obtained from .data stay valid across a reload.
+
     def load_from_file(self, path: str) -> None:
         """Load flash contents from a .bin file."""
         p = Path(path)
-        raw = p.read_bytes()
-        if len(raw) != FLASH_SIZE:
-            raise ValueError(f"File {path} is {len(raw)} bytes (expected {FLASH_SIZE})")
-        self._data = bytearray(raw)
+        size = p.stat().st_size
+        if size != FLASH_SIZE:
+            raise ValueError(f"File {path} is {size} bytes (expected {FLASH_SIZE})")
+        with p.open('rb') as f:
+            f.readinto(self._data)
         log.info("Flash loaded from %s", path)
 
     def save_to_file(self, path: str) -> None:
         """Save flash contents to a .bin file."""
-        Path(path).write_bytes(bytes(self._data))
+        Path(path).write_bytes(self._data)
         log.info("Flash saved to %s", path)
 
     def load_from_bytes(self, data: bytes) -> None:
-        """Load flash contents from bytes."""
+        """Load flash contents from bytes (or any same-size buffer)."""
         if len(data) != FLASH_SIZE:
             raise ValueError(f"Data is {len(data)} bytes (expected {FLASH_SIZE})")
-        self._data = bytearray(data)
+        self._data[:] = data
 
     # ── Address Helpers ──
 
     @staticmethod
     def addr_to_sector(address: int) -> int:
         """Get sector number (0-7) for a given address."""
-        return (address & 0x1FFFF) // SECTOR_SIZE
+        return (address & _ADDR_MASK) >> _SECTOR_SHIFT
 
     @staticmethod
     def sector_base(sector: int) -> int:
         """Get base address for a sector."""
-        return sector * SECTOR_SIZE
+        return sector << _SECTOR_SHIFT
 
     def is_sector_protected(self, sector: int) -> bool:
         """Check if a sector is write-protected."""
-        return self._sector_protect[sector] == SECTOR_PROTECT_PROTECTED
+        return bool((self._prot_mask >> sector) & 1)
+
+    def set_sector_protect(self, sector: int, protected: bool = True) -> None:
+        """Set or clear write protection for a sector (0-7)."""
+        if protected:
+            self._prot_mask |= 1 << sector
+        else:
+            self._prot_mask &= ~(1 << sector)
 
     # ── Core Operations ──
 
@@ -283,47 +349,13 @@ class AMD29F010:
         In AUTOSELECT mode returns manufacturer/device/protect data.
         In PROGRAMMING/ERASING mode returns toggle-bit status.
         """
-        address = address & 0x1FFFF  # Mask to 128KB
-
-        if self._state == FlashState.AUTOSELECT:
-            self.stats['id_reads'] += 1
-            # Autoselect mode reads
-            low_addr = address & 0xFF
-            if low_addr == 0x00:
-                return MANUFACTURER_ID  # 0x01 = AMD
-            elif low_addr == 0x01:
-                return DEVICE_ID        # 0x20 = Am29F010
-            elif low_addr == 0x02:
-                # Sector protect status
-                sector = self.addr_to_sector(address)
-                return self._sector_protect[sector]
-            else:
-                return 0x00
-
-        elif self._state in (FlashState.PROGRAMMING, FlashState.ERASING):
-            # Toggle bit polling (DQ6)
-            result = 0
-            if not self._program_complete:
-                result = 0x40 if self._toggle_bit else 0x00
-                self._toggle_bit = not self._toggle_bit
-                if self._error_flag:
-                    result |= 0x20  # DQ5 = exceeded time limit
-            else:
-                result = self._data[address]
-                self._state = FlashState.READ
-            return result
-
-        else:
-            # Normal read
-            self.stats['reads'] += 1
-            return self._data[address]
+        return self._read_dispatch[self._state](address & _ADDR_MASK)
 
     def write(self, address: int, value: int) -> None:
         """
         Write a byte to flash (command or data).
         Implements the full AMD command state machine.
         """
-        address = address & 0x1FFFF
         value = value & 0xFF
 
         # Reset command (F0) works from ANY state
@@ -331,68 +363,88 @@ class AMD29F010:
             self._reset()
             return
 
-        if self._state == FlashState.READ:
-            if address == CMD_ADDR_1 and value == CMD_UNLOCK_1:
-                self._state = FlashState.UNLOCK_1
+        self._write_dispatch[self._state](address & _ADDR_MASK, value)
 
-        elif self._state == FlashState.UNLOCK_1:
-            if address == CMD_ADDR_2 and value == CMD_UNLOCK_2:
-                self._state = FlashState.UNLOCK_2
-            else:
-                self._state = FlashState.READ
+    # ── State Handlers (one per FlashState, see _read/_write_dispatch) ──
 
-        elif self._state == FlashState.UNLOCK_2:
-            if address == CMD_ADDR_1:
-                if value == CMD_AUTOSELECT:
-                    self._state = FlashState.AUTOSELECT
-                    log.debug("Entered autoselect (software ID) mode")
-                elif value == CMD_PROGRAM:
-                    self._state = FlashState.PROGRAM
-                    log.debug("Program mode — waiting for data byte")
-                elif value == CMD_ERASE_SETUP:
-                    self._state = FlashState.ERASE_SETUP
-                    log.debug("Erase setup — waiting for second unlock")
-                else:
-                    self._state = FlashState.READ
-            else:
-                self._state = FlashState.READ
+    def _r_array(self, address: int) -> int:
+        # Normal read (also mid-command: unlock cycles don't change reads)
+        self._n_reads += 1
+        return self._data[address]
 
-        elif self._state == FlashState.AUTOSELECT:
-            if address == CMD_ADDR_1 and value == CMD_UNLOCK_1:
-                self._state = FlashState.UNLOCK_1
+    def _r_autoselect(self, address: int) -> int:
+        self._n_id_reads += 1
+        # Autoselect mode reads: $00 = AMD, $01 = Am29F010, $02 = sector protect
+        low_addr = address & 0xFF
+        if low_addr == 0x02:
+            return (self._prot_mask >> (address >> _SECTOR_SHIFT)) & 1
+        return _AUTOSELECT_IDS[low_addr]
 
-        elif self._state == FlashState.PROGRAM:
-            self._program_byte(address, value)
+    def _r_status(self, address: int) -> int:
+        # Toggle bit polling (DQ6 flips on every read, DQ5 = exceeded time limit)
+        if not self._program_complete:
+            result = self._toggle | (0x20 if self._error_flag else 0x00)
+            self._toggle ^= 0x40
+            return result
+        self._state = FlashState.READ
+        return self._data[address]
 
-        elif self._state == FlashState.ERASE_SETUP:
-            if address == CMD_ADDR_1 and value == CMD_UNLOCK_1:
-                self._state = FlashState.ERASE_UNLOCK_1
-            else:
-                self._state = FlashState.READ
+    def _w_read(self, address: int, value: int) -> None:
+        # READ and AUTOSELECT: only a new unlock cycle is recognised
+        if address == CMD_ADDR_1 and value == CMD_UNLOCK_1:
+            self._state = FlashState.UNLOCK_1
 
-        elif self._state == FlashState.ERASE_UNLOCK_1:
-            if address == CMD_ADDR_2 and value == CMD_UNLOCK_2:
-                self._state = FlashState.ERASE_UNLOCK_2
-            else:
-                self._state = FlashState.READ
+    def _w_unlock_1(self, address: int, value: int) -> None:
+        if address == CMD_ADDR_2 and value == CMD_UNLOCK_2:
+            self._state = FlashState.UNLOCK_2
+        else:
+            self._state = FlashState.READ
 
-        elif self._state == FlashState.ERASE_UNLOCK_2:
-            if value == CMD_SECTOR_ERASE:
-                self._erase_sector(address)
-            elif value == CMD_CHIP_ERASE and address == CMD_ADDR_1:
-                self._erase_chip()
+    def _w_unlock_2(self, address: int, value: int) -> None:
+        if address == CMD_ADDR_1:
+            if value == CMD_AUTOSELECT:
+                self._state = FlashState.AUTOSELECT
+                log.debug("Entered autoselect (software ID) mode")
+            elif value == CMD_PROGRAM:
+                self._state = FlashState.PROGRAM
+                log.debug("Program mode — waiting for data byte")
+            elif value == CMD_ERASE_SETUP:
+                self._state = FlashState.ERASE_SETUP
+                log.debug("Erase setup — waiting for second unlock")
             else:
                 self._state = FlashState.READ
+        else:
+            self._state = FlashState.READ
+
+    def _w_erase_setup(self, address: int, value: int) -> None:
+        if address == CMD_ADDR_1 and value == CMD_UNLOCK_1:
+            self._state = FlashState.ERASE_UNLOCK_1
+        else:
+            self._state = FlashState.READ
+
+    def _w_erase_unlock_1(self, address: int, value: int) -> None:
+        if address == CMD_ADDR_2 and value == CMD_UNLOCK_2:
+            self._state = FlashState.ERASE_UNLOCK_2
+        else:
+            self._state = FlashState.READ
+
+    def _w_erase_unlock_2(self, address: int, value: int) -> None:
+        if value == CMD_SECTOR_ERASE:
+            self._erase_sector(address)
+        elif value == CMD_CHIP_ERASE and address == CMD_ADDR_1:
+            self._erase_chip()
+        else:
+            self._state = FlashState.READ
 
-        elif self._state in (FlashState.PROGRAMMING, FlashState.ERASING):
-            log.warning("Write during busy state ignored (addr=$%05X)", address)
+    def _w_busy(self, address: int, value: int) -> None:
+        log.warning("Write during busy state ignored (addr=$%05X)", address)
 
     def poll(self, address: int) -> Tuple[bool, bool]:
         """
         Poll flash status at address (toggle-bit check).
         Returns (complete, error).
         """
-        if self._state in (FlashState.PROGRAMMING, FlashState.ERASING):
+        if self._state >= FlashState.PROGRAMMING:
             self._program_complete = True
             self._state = FlashState.READ
             return (True, self._error_flag)
@@ -404,8 +456,9 @@ class AMD29F010:
         """Return to read array mode."""
         self._state = FlashState.READ
         self._program_complete = True
+        self._toggle = 0
         self._error_flag = False
-        self.stats['resets'] += 1
+        self._n_resets += 1
         log.debug("Flash reset to read mode")
 
     def _program_byte(self, address: int, value: int) -> None:
@@ -414,61 +467,60 @@ class AMD29F010:
         NOR flash rule: can only clear bits (1→0), cannot set bits (0→1).
         Result = existing_data AND new_value.
         """
-        sector = self.addr_to_sector(address)
-        if self.is_sector_protected(sector):
+        sector = address >> _SECTOR_SHIFT  # address already masked by write()
+        if (self._prot_mask >> sector) & 1:
             log.warning("Program rejected: sector %d is protected", sector)
             self._error_flag = True
             self._state = FlashState.READ
             return
 
-        old_val = self._data[address]
+        data = self._data
+        old_val = data[address]
         new_val = old_val & value  # NOR AND semantics
 
         if new_val != value:
             log.debug("Program imperfect at $%05X: wanted $%02X, got $%02X (old=$%02X)",
                       address, value, new_val, old_val)
-            self.stats['program_failures'] += 1
+            self._n_program_failures += 1
 
-        self._data[address] = new_val
-        self.stats['programs'] += 1
+        data[address] = new_val
+        self._n_programs += 1
 
         self._state = FlashState.PROGRAMMING
         self._program_complete = True
-        self._toggle_bit = False
+        self._toggle = 0
         self._error_flag = False
 
         log.debug("Programmed $%05X: $%02X -> $%02X", address, old_val, new_val)
 
     def _erase_sector(self, address: int) -> None:
         """Erase a 16KB sector (set all bytes to 0xFF)."""
-        sector = self.addr_to_sector(address)
-        if self.is_sector_protected(sector):
+        sector = address >> _SECTOR_SHIFT  # address already masked by write()
+        if (self._prot_mask >> sector) & 1:
             log.warning("Erase rejected: sector %d is protected", sector)
             self._error_flag = True
             self._state = FlashState.READ
             return
 
-        base = self.sector_base(sector)
-        for i in range(SECTOR_SIZE):
-            self._data[base + i] = ERASED_BYTE
+        base = sector << _SECTOR_SHIFT
+        self._data[base:base + SECTOR_SIZE] = _ERASED_SECTOR
 
-        self.stats['sector_erases'] += 1
+        self._n_sector_erases += 1
         self._state = FlashState.ERASING
         self._program_complete = True
-        self._toggle_bit = False
+        self._toggle = 0
         self._error_flag = False
 
         log.info("Erased sector %d ($%05X-$%05X)", sector, base, base + SECTOR_SIZE - 1)
 
     def _erase_chip(self) -> None:
         """Erase entire chip (set all bytes to 0xFF)."""
-        for i in range(FLASH_SIZE):
-            self._data[i] = ERASED_BYTE
+        self._data[:] = _ERASED_CHIP
 
-        self.stats['chip_erases'] += 1
+        self._n_chip_erases += 1
         self._state = FlashState.ERASING
         self._program_complete = True
-        self._toggle_bit = False
+        self._toggle = 0
         self._error_flag = False
 
         log.info("Full chip erase completed")
@@ -478,40 +530,86 @@ class AMD29F010:
     def erase_sector_by_index(self, sector: int) -> bool:
         """
         Erase a sector by index (0-7).
-        Runs the full AMD command sequence internally.
+        Same effect as the 6-cycle AMD command sequence, without replaying it.
         Returns True on success.
         """
         if not 0 <= sector < NUM_SECTORS:
             log.error("Invalid sector index: %d", sector)
             return False
 
-        base = self.sector_base(sector)
-
-        self.write(CMD_ADDR_1, CMD_UNLOCK_1)
-        self.write(CMD_ADDR_2, CMD_UNLOCK_2)
-        self.write(CMD_ADDR_1, CMD_ERASE_SETUP)
-        self.write(CMD_ADDR_1, CMD_UNLOCK_1)
-        self.write(CMD_ADDR_2, CMD_UNLOCK_2)
-        self.write(base, CMD_SECTOR_ERASE)
-
+        base = self._fast_erase(sector)
         complete, error = self.poll(base)
         return complete and not error
 
     def program_byte_at(self, address: int, value: int) -> bool:
         """
-        Program a single byte using the full command sequence.
+        Program a single byte.
+        Same effect as the AA/55/A0/data sequence, without replaying it.
         Returns True on success.
         """
-        self.write(CMD_ADDR_1, CMD_UNLOCK_1)
-        self.write(CMD_ADDR_2, CMD_UNLOCK_2)
-        self.write(CMD_ADDR_1, CMD_PROGRAM)
-        self.write(address, value)
+        address &= _ADDR_MASK
+        value &= 0xFF
+        self._fast_program(address, value)
 
         complete, error = self.poll(address)
         if complete and not error:
             return self._data[address] == value
         return False
 
+    def program_bytes(self, start: int, data: bytes) -> int:
+        """
+        Program a run of bytes in one operation (NOR AND over the slice).
+        Protection and range are checked once for the whole run.
+        Returns the number of bytes programmed (0 if rejected).
+        """
+        n = len(data)
+        end = start + n
+        if start < 0 or end > FLASH_SIZE:
+            log.error("Program range $%05X+%d outside flash", start, n)
+            return 0
+        if not n:
+            return 0
+        first, last = start >> _SECTOR_SHIFT, (end - 1) >> _SECTOR_SHIFT
+        span = ((2 << last) - 1) ^ ((1 << first) - 1)  # bits first..last
+        if self._prot_mask & span:
+            log.warning("Program rejected: $%05X-$%05X touches a protected sector",
+                        start, end - 1)
+            self._error_flag = True
+            self._state = FlashState.READ
+            return 0
+
+        # Whole-run AND via big ints — one C-level pass, no per-byte loop
+        wanted = int.from_bytes(data, 'big')
+        merged = int.from_bytes(self._data[start:end], 'big') & wanted
+        self._data[start:end] = merged.to_bytes(n, 'big')
+        # Bytes where a 0 bit could not be raised back to 1
+        failures = n - (merged ^ wanted).to_bytes(n, 'big').count(0)
+        if failures:
+            log.debug("Program imperfect: %d of %d bytes at $%05X kept 0 bits",
+                      failures, n, start)
+        self._n_program_failures += failures
+        self._n_programs += n
+
+        self._state = FlashState.READ
+        self._program_complete = True
+        self._toggle = 0
+        self._error_flag = False
+
+        log.debug("Programmed $%05X-$%05X (%d bytes)", start, end - 1, n)
+        return n
+
+    def _fast_program(self, address: int, value: int) -> None:
+        """Enter the program step directly — the unlock cycles only move state."""
+        self._state = FlashState.PROGRAM
+        self._program_byte(address, value)
+
+    def _fast_erase(self, sector: int) -> int:
+        """Enter the sector-erase confirm step directly; returns the sector base."""
+        base = sector << _SECTOR_SHIFT
+        self._state = FlashState.ERASE_UNLOCK_2
+        self._erase_sector(base)
+        return base
+
     def read_software_id(self) -> Tuple[int, int]:
         """
         Read manufacturer + device ID.
@@ -546,22 +644,23 @@ class AMD29F010:
     def verify_sector_erased(self, sector: int) -> bool:
         """Check if a sector is fully erased (all 0xFF)."""
         base = self.sector_base(sector)
-        for i in range(SECTOR_SIZE):
-            if self._data[base + i] != ERASED_BYTE:
-                return False
-        return True
+        return self._data[base:base + SECTOR_SIZE] == _ERASED_SECTOR
 
     def verify_data(self, offset: int, expected: bytes) -> Tuple[bool, int]:
         """
         Verify flash contents match expected data.
         Returns (match, first_mismatch_offset).
         """
-        for i, b in enumerate(expected):
-            addr = offset + i
-            if addr >= FLASH_SIZE:
-                return (False, addr)
-            if self._data[addr] != b:
-                return (False, addr)
+        end = offset + len(expected)
+        actual = self._data[offset:min(end, FLASH_SIZE)]
+        n = len(actual)
+        if actual != expected[:n]:
+            # Rare failure path — only now walk to the first differing byte
+            for i, (a, b) in enumerate(zip(actual, expected)):
+                if a != b:
+                    return (False, offset + i)
+        if end > FLASH_SIZE:
+            return (False, max(offset, FLASH_SIZE))
         return (True, -1)
 
     def compute_checksum(self, start: int = 0x2000, end: int = 0x20000,
@@ -570,42 +669,41 @@ class AMD29F010:
         Compute VXY-style 16-bit checksum over flash contents.
         Sums all bytes, skipping the checksum storage region.
         """
-        total = 0
-        for addr in range(start, min(end, FLASH_SIZE)):
-            if skip_start <= addr <= skip_end:
-                continue
-            total = (total + self._data[addr]) & 0xFFFF
-        return total
+        data = self._data
+        end = min(end, FLASH_SIZE)
+        total = sum(data[start:end])
+        lo, hi = max(skip_start, start), min(skip_end + 1, end)
+        if lo < hi:
+            total -= sum(data[lo:hi])
+        return total & 0xFFFF
 
     # ── Debug / Display ──
 
     def dump_sector_info(self) -> str:
         """Return a formatted string showing sector status."""
-        lines = ["AMD Am29F010 -- Sector Map:"]
+        data = self._data
+        rows = []
         for s in range(NUM_SECTORS):
-            base = self.sector_base(s)
-            end = base + SECTOR_SIZE - 1
-            erased = self.verify_sector_erased(s)
-            prot = "PROT" if self.is_sector_protected(s) else "    "
-            state = "ERASED" if erased else "WRITTEN"
-            used = sum(1 for i in range(SECTOR_SIZE) if self._data[base + i] != 0xFF)
-            lines.append(
-                f"  Sector {s}: ${base:05X}-${end:05X}  {prot}  {state:7s}  "
+            base = s << _SECTOR_SHIFT
+            # One count per sector (in place, no slice) gives both columns
+            used = SECTOR_SIZE - data.count(ERASED_BYTE, base, base + SECTOR_SIZE)
+            prot = "PROT" if (self._prot_mask >> s) & 1 else "    "
+            state = "WRITTEN" if used else "ERASED"
+            rows.append(
+                f"  Sector {s}: ${base:05X}-${base + SECTOR_SIZE - 1:05X}  {prot}  {state:7s}  "
                 f"({used:5d}/{SECTOR_SIZE} bytes used)"
             )
-        return "\n".join(lines)
+        return "\n".join(["AMD Am29F010 -- Sector Map:", *rows])
 
     def dump_stats(self) -> str:
         """Return formatted statistics."""
-        lines = ["AMD Am29F010 -- Statistics:"]
-        for k, v in self.stats.items():
-            lines.append(f"  {k}: {v}")
-        return "\n".join(lines)
+        return "\n".join(["AMD Am29F010 -- Statistics:",
+                          *[f"  {k}: {v}" for k, v in self.stats.items()]])
 
     def __repr__(self) -> str:
         return (f"AMD29F010(state={self._state.name}, "
-                f"erases={self.stats['sector_erases']}, "
-                f"programs={self.stats['programs']})")
+                f"erases={self._n_sector_erases}, "
+                f"programs={self._n_programs})")
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -633,6 +731,10 @@ class BankedFlash:
         0x50: (0x18000, 0x1FFFF, 0x8000),
     }
 
+    # flash_addr = cpu_addr + offset — one addition for every bank
+    BANK_OFFSETS = {bank: file_start - cpu_base
+                    for bank, (file_start, _, cpu_base) in BANKS.items()}
+
     BANK_SECTORS = {
         0x48: [0, 1, 2, 3],
         0x58: [4, 5],
@@ -653,6 +755,7 @@ class BankedFlash:
     def __init__(self, flash: Optional[AMD29F010] = None):
         self.flash = flash or AMD29F010()
         self._current_bank = 0x48
+        self._active_off = self.BANK_OFFSETS[0x48]
 
     @property
     def current_bank(self) -> int:
@@ -664,30 +767,27 @@ class BankedFlash:
             log.error("Invalid bank: 0x%02X", bank)
             return False
         self._current_bank = bank
+        self._active_off = self.BANK_OFFSETS[bank]
         log.debug("Bank selected: 0x%02X", bank)
         return True
 
     def cpu_to_flash_addr(self, cpu_addr: int, bank: int = None) -> int:
         """Convert CPU address + bank to flash linear address."""
-        bank = bank or self._current_bank
-        file_start, file_end, cpu_base = self.BANKS[bank]
-
-        if bank == 0x48:
-            return cpu_addr
-        else:
-            return file_start + (cpu_addr - cpu_base)
+        if not bank:
+            return cpu_addr + self._active_off
+        return cpu_addr + self.BANK_OFFSETS[bank]
 
     def read(self, cpu_addr: int) -> int:
-        flash_addr = self.cpu_to_flash_addr(cpu_addr)
-        return self.flash.read(flash_addr)
+        return self.flash.read(cpu_addr + self._active_off)
 
     def write(self, cpu_addr: int, value: int) -> None:
-        flash_addr = self.cpu_to_flash_addr(cpu_addr)
-        self.flash.write(flash_addr, value)
+        self.flash.write(cpu_addr + self._active_off, value)
 
     def program_byte(self, cpu_addr: int, value: int) -> bool:
-        flash_addr = self.cpu_to_flash_addr(cpu_addr)
-        return self.flash.program_byte_at(flash_addr, value)
+        return self.flash.program_byte_at(cpu_addr + self._active_off, value)
+
+    def program_bytes(self, cpu_addr: int, data: bytes) -> int:
+        return self.flash.program_bytes(cpu_addr + self._active_off, data)
 
     def erase_sector(self, bank_byte: int, sector_addr_byte: int) -> bool:
         """
@@ -714,6 +814,7 @@ class BankedFlash:
 def _self_test():
     """Run a standalone self-test of the flash simulator."""
     # Use setup_logging with console output at INFO for self-test visibility
+    setup_logging()
     test_log = setup_logging(name="vecu.flash.selftest", console_level=logging.INFO)
 
     print("=== AMD Am29F010 Virtual Flash -- Self-Test ===\n")
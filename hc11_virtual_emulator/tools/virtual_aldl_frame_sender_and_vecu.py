@@ -177,6 +177,12 @@ MODE16_FLASH_WRITE = 0x10
 # ALDL frame encoding (from kingai_commie_flasher.py)
 ALDL_LENGTH_OFFSET = 85
 
+# Big-endian frame fields, compiled once: 16-bit address at [3:5]; the 24-bit
+# address at [3:6] is read as a 32-bit word from [2:6] with the mode masked off
+_ADDR16 = struct.Struct('>H')
+_ADDR24 = struct.Struct('>I')
+_MODE1_RPM_IDLE = struct.Struct('>HH')  # Mode 1 offsets 0-3
+
 # Security — seed/key algorithm constants (from kingai_commie_flasher.py)
 SEED_KEY_MAGIC = 37709    # 0x934D — from kingai_commie_flasher.py
 SEED_HI = 0x42
@@ -221,7 +227,7 @@ KNOWN_ADDRESSES = {
 
 def compute_checksum(frame: bytearray, end: int) -> int:
     """Two's complement checksum (sum of all bytes before end, mod 256, negated)."""
-    return (256 - (sum(frame[:end]) & 0xFF)) & 0xFF
+    return -sum(frame[:end]) & 0xFF
 
 
 def apply_checksum(frame: bytearray) -> bytearray:
@@ -238,8 +244,8 @@ def verify_frame(data: bytes) -> bool:
     cs_pos = data[1] - 83
     if cs_pos < 3 or cs_pos >= len(data):
         return False
-    expected = compute_checksum(bytearray(data[:cs_pos]), cs_pos)
-    return data[cs_pos] == expected
+    # A valid frame sums to 0 mod 256 through its checksum byte — one slice, one sum
+    return not sum(data[:cs_pos + 1]) & 0xFF
 
 
 def frame_wire_length(frame: bytes) -> int:
@@ -287,12 +293,12 @@ def compute_vy_checksum(data: bytearray, start: int = 0x2000, end: int = 0x20000
     Sums all bytes in range, skipping the checksum storage region.
     (From virtual_128kb_eeprom.py compute_checksum method)
     """
-    total = 0
-    for addr in range(start, min(end, len(data))):
-        if skip_start <= addr <= skip_end:
-            continue
-        total = (total + data[addr]) & 0xFFFF
-    return total
+    end = min(end, len(data))
+    total = sum(data[start:end])
+    lo, hi = max(skip_start, start), min(skip_end + 1, end)
+    if lo < hi:
+        total -= sum(data[lo:hi])
+    return total & 0xFFFF
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -351,13 +357,18 @@ class VirtualECU:
                 log.warning("Loaded %d bytes (expected %d)", len(data), FLASH_SIZE)
 
             if self.flash_chip:
-                self.flash_chip.load_from_bytes(bytes(self._flash_data))
+                self.flash_chip.load_from_bytes(self._flash_data)
             log.info("Loaded %d bytes from %s", len(data), Path(bin_path).name)
         else:
             if self.flash_chip:
                 pass  # Already starts erased (all 0xFF)
             log.info("Running with blank flash (all 0xFF)")
 
+        # Response scratch frame — every reply is built here, then copied out
+        # at wire length (header, payload and checksum overwrite all of it,
+        # so it is never re-zeroed). One per VECU; the TCP server is serial.
+        self._tx_buf = bytearray(FRAME_SIZE)
+
         # Actuator test state (Mode 4)
         self._actuator_active = False
         self._actuator_id = 0
@@ -424,15 +435,19 @@ class VirtualECU:
 
     def _make_ack(self, mode: int, extra: bytes = b'') -> bytes:
         """Build a simple ACK response."""
-        resp = bytearray(FRAME_SIZE)
+        return self._respond(mode, extra)
+
+    def _respond(self, mode: int, payload: bytes) -> bytes:
+        """Build [device_id, 0x56+n, mode, payload..., checksum] in the scratch frame."""
+        n = len(payload)
+        cs_pos = 3 + n
+        resp = self._tx_buf
         resp[0] = self.device_id
-        resp[1] = 0x56 + len(extra)
+        resp[1] = 0x56 + n
         resp[2] = mode
-        for i, b in enumerate(extra):
-            resp[3 + i] = b
-        apply_checksum(resp)
-        wire_len = frame_wire_length(resp)
-        return bytes(resp[:wire_len])
+        resp[3:cs_pos] = payload
+        resp[cs_pos] = compute_checksum(resp, cs_pos)
+        return bytes(resp[:cs_pos + 1])
 
     # ── Mode 8: Silence Bus ──
 
@@ -517,13 +532,10 @@ class VirtualECU:
         # Simulate realistic idle values (VY V6 Ecotec at ~800 RPM, warmed up)
         rpm = 800
         rpm_raw = rpm // 25  # scale = 25.0, so raw = RPM/25
-        data[0] = (rpm_raw >> 8) & 0xFF    # RPM high byte (offset 0)
-        data[1] = rpm_raw & 0xFF           # RPM low byte (offset 1)
-
         desired_idle = 750
         idle_raw = desired_idle // 25
-        data[2] = (idle_raw >> 8) & 0xFF   # Desired Idle high (offset 2)
-        data[3] = idle_raw & 0xFF          # Desired Idle low (offset 3)
+        # RPM hi/lo (offsets 0-1), Desired Idle hi/lo (offsets 2-3)
+        _MODE1_RPM_IDLE.pack_into(data, 0, rpm_raw, idle_raw)
 
         data[4] = 128                # ECT Voltage ~2.5V (offset 4, X*5/255)
         data[5] = 120                # ECT Temp ~50°C (offset 5, X*0.75-40)
@@ -557,14 +569,7 @@ class VirtualECU:
         data[0] = max(0, min(255, data[0] + random.randint(-1, 1)))
         data[14] = max(0, min(255, 128 + random.randint(-10, 10)))  # O2 flutter
 
-        resp = bytearray(FRAME_SIZE)
-        resp[0] = self.device_id
-        resp[1] = 0x56 + len(data)
-        resp[2] = MODE1_DATASTREAM
-        resp[3:3 + len(data)] = data
-        apply_checksum(resp)
-        wire_len = frame_wire_length(resp)
-        return bytes(resp[:wire_len])
+        return self._respond(MODE1_DATASTREAM, data)
 
     # ── Mode 2: Read RAM (64-byte blocks) ──
 
@@ -577,10 +582,10 @@ class VirtualECU:
         self.stats['mode2_reads'] += 1
         if frame[1] == 0x59:
             # Extended 3-byte addressing
-            addr = (frame[3] << 16) | (frame[4] << 8) | frame[5]
+            addr = _ADDR24.unpack_from(frame, 2)[0] & 0xFFFFFF
         else:
             # Standard 2-byte addressing
-            addr = (frame[3] << 8) | frame[4]
+            addr = _ADDR16.unpack_from(frame, 3)[0]
 
         flash_data = self.flash
         end = min(addr + 64, FLASH_SIZE)
@@ -588,13 +593,7 @@ class VirtualECU:
         if len(block) < 64:
             block = block + bytes(64 - len(block))
 
-        resp = bytearray(FRAME_SIZE)
-        resp[0] = self.device_id
-        resp[1] = 0x55 + len(block) + 1
-        resp[2] = MODE2_READ_RAM
-        resp[3:3 + len(block)] = block
-        apply_checksum(resp)
-        wire_len = frame_wire_length(resp)
+        resp = self._respond(MODE2_READ_RAM, block)
 
         # Log with known address annotation
         addr_note = KNOWN_ADDRESSES.get(addr, "")
@@ -603,7 +602,7 @@ class VirtualECU:
         else:
             log.debug("Read $%05X: %s...", addr, hex_str(block[:8]))
 
-        return bytes(resp[:wire_len])
+        return resp
 
     # ── Mode 3: Read N Bytes ──
 
@@ -617,7 +616,7 @@ class VirtualECU:
         if len(frame) < 6:
             return None
 
-        addr = (frame[3] << 8) | frame[4]
+        addr = _ADDR16.unpack_from(frame, 3)[0]
         count = frame[5]
         if count == 0:
             count = 1
@@ -630,16 +629,8 @@ class VirtualECU:
         if len(block) < count:
             block = block + bytes(count - len(block))
 
-        resp = bytearray(FRAME_SIZE)
-        resp[0] = self.device_id
-        resp[1] = ALDL_LENGTH_OFFSET + len(block) + 1
-        resp[2] = MODE3_READ_BYTES
-        resp[3:3 + len(block)] = block
-        apply_checksum(resp)
-        wire_len = frame_wire_length(resp)
-
         log.debug("Read %d bytes at $%04X (Mode 3)", count, addr)
-        return bytes(resp[:wire_len])
+        return self._respond(MODE3_READ_BYTES, block)
 
     # ── Mode 4: Actuator Test ──
 
@@ -700,7 +691,7 @@ class VirtualECU:
         if len(frame) < 6:
             return None
 
-        addr = (frame[3] << 8) | frame[4]
+        addr = _ADDR16.unpack_from(frame, 3)[0]
         data_start = 5
         data_len = frame[1] - ALDL_LENGTH_OFFSET - 3  # subtract mode + 2 addr bytes
         if data_len < 1:
@@ -711,12 +702,9 @@ class VirtualECU:
         if addr < 0x4000 or addr > 0x7FFF:
             log.warning("Mode 10 write to non-cal address $%04X (outside $4000-$7FFF)", addr)
 
-        # Write through flash simulator if available
+        # Write through flash simulator if available (one bulk NOR AND per frame)
         if self.flash_chip:
-            for i, b in enumerate(data):
-                target = addr + i
-                if target < FLASH_SIZE:
-                    self.flash_chip.program_byte_at(target, b)
+            self.flash_chip.program_bytes(addr, data[:FLASH_SIZE - addr])
         else:
             end = min(addr + len(data), FLASH_SIZE)
             self._flash_data[addr:end] = data[:end - addr]
@@ -735,15 +723,13 @@ class VirtualECU:
         self.stats['mode16_writes'] += 1
         if len(frame) > 38:
             # Extract 3-byte address + 32 bytes data
-            addr = (frame[3] << 16) | (frame[4] << 8) | frame[5]
+            addr = _ADDR24.unpack_from(frame, 2)[0] & 0xFFFFFF
             data = frame[6:6 + 32]
 
             if self.flash_chip:
                 # Write through flash simulator (enforces NOR AND semantics)
-                for i, b in enumerate(data):
-                    target = addr + i
-                    if target < FLASH_SIZE:
-                        self.flash_chip.program_byte_at(target, b)
+                if addr < FLASH_SIZE:
+                    self.flash_chip.program_bytes(addr, data[:FLASH_SIZE - addr])
                 log.info("Flash write $%05X: %d bytes via AMD29F010 sim (Mode 16)", addr, len(data))
             else:
                 end = min(addr + len(data), FLASH_SIZE)
@@ -762,8 +748,7 @@ class VirtualECU:
             return ok
         else:
             base = sector * SECTOR_SIZE
-            for i in range(SECTOR_SIZE):
-                self._flash_data[base + i] = 0xFF
+            self._flash_data[base:base + SECTOR_SIZE] = b'\xFF' * SECTOR_SIZE
             log.info("Sector %d erased (raw bytearray)", sector)
             return True
 